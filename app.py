@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, g
 import sqlite3
 import os
 from werkzeug.utils import secure_filename
@@ -8,7 +8,13 @@ from models.ml_model import CareerRecommendationModel
 from models.recommendation_engine import RecommendationEngine
 from utils.resume_parser import ResumeParser
 from utils.skill_extractor import SkillExtractor
-from database.models import init_db, get_db_connection
+from utils.job_queue import JobQueue
+from utils.resume_cache import ResumeCache, hash_bytes
+from utils.response_cache import ResponseCache
+from database.models import (
+    init_db, get_db_connection, db_connection, get_user_data_version, release_thread_connection, career_catalog,
+    public_career
+)
 
 app = Flask(__name__)
 
@@ -19,28 +25,43 @@ def inject_now():
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
+app.config['RESUME_WORKERS'] = int(os.environ.get('RESUME_WORKERS', 2))
+app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
 
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 init_db()
 recommendation_engine = RecommendationEngine()
-
-# Create placeholder classes for missing modules
-class ResumeParser:
-    def parse_resume(self, file_path):
-        return {'text': 'Sample resume text'}
-
-class SkillExtractor:
-    def extract_skills(self, text):
-        return {'Python': 0.8, 'JavaScript': 0.7, 'SQL': 0.6}
+# Trained artifacts are optional; scoring works without them
+try:
+    if recommendation_engine.ml_model.load_artifacts():
+        print(f"Loaded model {recommendation_engine.ml_model.model_version}")
+except Exception as e:
+    print(f"Error loading model artifacts: {e}")
 
 resume_parser = ResumeParser()
 skill_extractor = SkillExtractor()
+resume_cache = ResumeCache()
+resume_jobs = JobQueue(max_workers=app.config['RESUME_WORKERS'])
+# Per-user dashboard data and recommendations, invalidated when the user's data changes
+response_cache = ResponseCache(max_entries=app.config['RESPONSE_CACHE_SIZE'],
+                               ttl=app.config['RESPONSE_CACHE_TTL'])
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@app.before_request
+def open_request_connection():
+    # Every get_db_connection() during the request reuses this pooled connection
+    g.db = get_db_connection()
+
+@app.teardown_request
+def close_request_connection(exception=None):
+    g.pop('db', None)
+    release_thread_connection()
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -54,23 +75,23 @@ def register():
         else:
             data = request.form
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO users (name, email, age, education_level, current_field, years_experience, location)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data['full_name'] if 'full_name' in data else data.get('name'),
-            data['email'],
-            data.get('age'),
-            data.get('education_level') or data.get('education'),
-            data.get('current_field'),
-            data.get('years_experience'),
-            data.get('location')
-        ))
-        user_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO users (name, email, age, education_level, current_field, years_experience, location)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                data['full_name'] if 'full_name' in data else data.get('name'),
+                data['email'],
+                data.get('age'),
+                data.get('education_level') or data.get('education'),
+                data.get('current_field'),
+                data.get('years_experience'),
+                data.get('location')
+            ))
+            user_id = cursor.lastrowid
+            conn.commit()
+        response_cache.invalidate_user(user_id)
         session['user_id'] = user_id
         session['user_name'] = data['full_name'] if 'full_name' in data else data.get('name')
 
@@ -106,29 +127,29 @@ def submit_assessment():
         else:
             data = request.form
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO assessments (user_id, interests, work_style_preferences,
-                                     career_goals, risk_tolerance, work_life_balance_priority,
-                                     salary_importance, completed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            user_id,
-            json.dumps(data.get('interests', [])),
-            json.dumps({
-                'team_preference': data.get('teamwork_preference') or data.get('team_preference'),
-                'leadership_preference': data.get('leadership_preference'),
-                'structure_preference': data.get('structure_preference')
-            }),
-            data.get('career_goals'),
-            data.get('risk_tolerance'),
-            data.get('work_life_balance'),
-            data.get('salary_importance'),
-            datetime.now()
-        ))
-        conn.commit()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO assessments (user_id, interests, work_style_preferences,
+                                         career_goals, risk_tolerance, work_life_balance_priority,
+                                         salary_importance, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                user_id,
+                json.dumps(data.get('interests', [])),
+                json.dumps({
+                    'team_preference': data.get('teamwork_preference') or data.get('team_preference'),
+                    'leadership_preference': data.get('leadership_preference'),
+                    'structure_preference': data.get('structure_preference')
+                }),
+                data.get('career_goals'),
+                data.get('risk_tolerance'),
+                data.get('work_life_balance'),
+                data.get('salary_importance'),
+                datetime.now()
+            ))
+            conn.commit()
+        response_cache.invalidate_user(user_id)
 
         if request.is_json:
             return jsonify({'success': True})
@@ -159,46 +180,101 @@ def process_resume():
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No file selected'})
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-            filename = timestamp + filename
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            resume_data = resume_parser.parse_resume(file_path)
-            extracted_skills = skill_extractor.extract_skills(resume_data['text'])
-            user_id = session['user_id']
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            for skill_name, confidence in extracted_skills.items():
-                cursor.execute('SELECT id FROM skills WHERE skill_name = ?', (skill_name,))
-                skill_row = cursor.fetchone()
-                if skill_row:
-                    skill_id = skill_row[0]
+            content = file.read()
+            content_hash = hash_bytes(content)
+            with db_connection() as conn:
+                # Reuse the stored copy of an identical upload instead of writing it again
+                existing = conn.execute(
+                    'SELECT file_path FROM resume_files WHERE content_hash = ? ORDER BY id LIMIT 1',
+                    (content_hash,)
+                ).fetchone()
+                if existing and os.path.exists(existing['file_path']):
+                    file_path = existing['file_path']
                 else:
-                    cursor.execute('INSERT INTO skills (skill_name, category, importance_score) VALUES (?, ?, ?)',
-                                   (skill_name, 'Technical', 0.7))
-                    skill_id = cursor.lastrowid
-                proficiency_level = min(5, max(1, int(confidence * 5)))
-                cursor.execute('''
-                    INSERT OR REPLACE INTO user_skills (user_id, skill_id, proficiency_level, source)
-                    VALUES (?, ?, ?, ?)
-                ''', (user_id, skill_id, proficiency_level, 'Resume'))
-            conn.commit()
-            conn.close()
-            return redirect(url_for('dashboard'))  # or wherever you want to go next
+                    filename = secure_filename(file.filename)
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+                    filename = timestamp + filename
+                    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                    with open(file_path, 'wb') as saved_file:
+                        saved_file.write(content)
+                conn.execute(
+                    'INSERT OR REPLACE INTO resume_files (user_id, file_path, content_hash) VALUES (?, ?, ?)',
+                    (session['user_id'], file_path, content_hash)
+                )
+                conn.commit()
+            response_cache.invalidate_user(session['user_id'])
+            # Parsing and extraction run on the worker pool; poll the status URL for results
+            job = resume_jobs.submit(process_resume_job, session['user_id'], file_path, content_hash,
+                                     owner=session['user_id'])
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': url_for('resume_job_status', job_id=job.id)
+            }), 202
         else:
             flash('Invalid file format')
             return redirect(url_for('upload_resume'))
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/resume_jobs/<job_id>')
+def resume_job_status(job_id):
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+    job = resume_jobs.get(job_id)
+    if not job or job.owner != session['user_id']:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    job_data = job.to_dict()
+    job_data['success'] = job.status != job.FAILED
+    return jsonify(job_data)
+
+def process_resume_job(job, user_id, file_path, content_hash=None):
+    """Parse a saved resume, extract skills and store them for the user"""
+    job.update(stage='extracting_skills', progress=0.1)
+    # Identical files reuse the skills extracted the first time they were seen
+    extracted_skills = resume_cache.extract_skills(resume_parser, skill_extractor, file_path, content_hash)
+
+    job.update(stage='saving', progress=0.8)
+    save_extracted_skills(user_id, extracted_skills)
+    response_cache.invalidate_user(user_id)
+
+    return {'skills': list(extracted_skills.keys())}
+
+def save_extracted_skills(user_id, extracted_skills):
+    """Store extracted skills and confidences as the user's resume skills"""
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        for skill_name, confidence in extracted_skills.items():
+            cursor.execute('SELECT id FROM skills WHERE skill_name = ?', (skill_name,))
+            skill_row = cursor.fetchone()
+            if skill_row:
+                skill_id = skill_row[0]
+            else:
+                cursor.execute('INSERT INTO skills (skill_name, category, importance_score) VALUES (?, ?, ?)',
+                               (skill_name, 'Technical', 0.7))
+                skill_id = cursor.lastrowid
+            proficiency_level = min(5, max(1, int(confidence * 5)))
+            cursor.execute('''
+                INSERT OR REPLACE INTO user_skills (user_id, skill_id, proficiency_level, source)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, skill_id, proficiency_level, 'Resume'))
+        conn.commit()
+
 @app.route('/get_recommendations')
 def get_recommendations():
     if 'user_id' not in session:
         return redirect(url_for('index'))
     try:
         user_id = session['user_id']
-        recommendations = recommendation_engine.generate_recommendations(user_id)
+        version = get_user_data_version(user_id)
+        recommendations = response_cache.get('recommendations', user_id, version)
+        if recommendations is None:
+            # Stored recommendations are reused until the user's inputs or the catalog change
+            recommendations = recommendation_engine.get_recommendations(user_id)
+            # Dashboard data lists saved recommendations, which may just have been rewritten
+            response_cache.invalidate_user(user_id)
+            response_cache.put('recommendations', user_id, version, recommendations)
         return render_template('recommendations.html', recommendations=recommendations)
     except Exception as e:
         flash(f'Error generating recommendations: {str(e)}')
@@ -207,35 +283,19 @@ def get_recommendations():
 @app.route('/api/career_details/<int:career_id>')
 def career_details(career_id):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT c.*, GROUP_CONCAT(s.skill_name) as required_skills
-            FROM careers c
-            LEFT JOIN career_skills cs ON c.id = cs.career_id
-            LEFT JOIN skills s ON cs.skill_id = s.id
-            WHERE c.id = ?
-            GROUP BY c.id
-        ''', (career_id,))
-
-        career = cursor.fetchone()
-        conn.close()
+        career = career_catalog.get_career(career_id)
         if career:
-            career_dict = dict(career)
-            career_dict['required_skills'] = career_dict['required_skills'].split(',') if career_dict['required_skills'] else []
+            career_dict = public_career(career)
+            career_dict['required_skills'] = list(career['required_skills'])
             return jsonify(career_dict)
         else:
             return jsonify({'error': 'Career not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/dashboard')
-def dashboard():
-    if 'user_id' not in session:
-        return redirect(url_for('index'))
-    try:
-        user_id = session['user_id']
-        conn = get_db_connection()
+def load_user_data(user_id):
+    """User row, skills and top saved recommendations shown on the dashboard"""
+    with db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
         user = dict(cursor.fetchone())
@@ -256,8 +316,20 @@ def dashboard():
             LIMIT 5
         ''', (user_id,))
         recent_recommendations = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return render_template('dashboard.html', user=user, skills=skills, recommendations=recent_recommendations)
+    return {'user': user, 'skills': skills, 'recommendations': recent_recommendations}
+
+def get_cached_user_data(user_id):
+    version = get_user_data_version(user_id)
+    return response_cache.get_or_compute('user_data', user_id, version, lambda: load_user_data(user_id))
+
+@app.route('/dashboard')
+def dashboard():
+    if 'user_id' not in session:
+        return redirect(url_for('index'))
+    try:
+        user_data = get_cached_user_data(session['user_id'])
+        return render_template('dashboard.html', user=user_data['user'], skills=user_data['skills'],
+                               recommendations=user_data['recommendations'])
     except Exception as e:
         flash(f'Error loading dashboard: {str(e)}')
         return render_template('dashboard.html', user={}, skills=[], recommendations=[])
@@ -268,51 +340,44 @@ def get_user_data():
         return jsonify({'success': False, 'error': 'User not logged in'}), 401
     user_id = session['user_id']
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
-        user = dict(cursor.fetchone())
-        cursor.execute('''
-            SELECT s.skill_name, us.proficiency_level, s.category
-            FROM user_skills us
-            JOIN skills s ON us.skill_id = s.id
-            WHERE us.user_id = ?
-            ORDER BY us.proficiency_level DESC
-        ''', (user_id,))
-        skills = [dict(row) for row in cursor.fetchall()]
-        cursor.execute('''
-            SELECT r.*, c.career_title, c.industry, c.avg_salary_min, c.avg_salary_max
-            FROM recommendations r
-            JOIN careers c ON r.career_id = c.id
-            WHERE r.user_id = ?
-            ORDER BY r.match_score DESC
-            LIMIT 5
-        ''', (user_id,))
-        recent_recommendations = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        user_data = get_cached_user_data(user_id)
         return jsonify({
             'success': True,
-            'user': user,
-            'skills': skills,
-            'recommendations': recent_recommendations
+            'user': user_data['user'],
+            'skills': user_data['skills'],
+            'recommendations': user_data['recommendations']
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/cache_stats')
+def cache_stats():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+    return jsonify({
+        'response_cache': response_cache.stats(),
+        'resume_jobs': resume_jobs.stats()
+    })
+
+@app.route('/api/model_stats')
+def model_stats():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'User not logged in'}), 401
+    return jsonify(recommendation_engine.ml_model.scoring_stats())
+
 @app.route('/api/skills_autocomplete')
 def skills_autocomplete():
     try:
         query = request.args.get('q', '').lower()
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT skill_name FROM skills
-            WHERE LOWER(skill_name) LIKE ?
-            ORDER BY importance_score DESC
-            LIMIT 10
-        ''', (f'%{query}%',))
-        skills = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT skill_name FROM skills
+                WHERE LOWER(skill_name) LIKE ?
+                ORDER BY importance_score DESC
+                LIMIT 10
+            ''', (f'%{query}%',))
+            skills = [row[0] for row in cursor.fetchall()]
         return jsonify(skills)
     except Exception as e:
         return jsonify([]), 500
@@ -0,0 +1,279 @@
+"""Recommendation path benchmark over synthetic databases.
+
+For every catalog size the runner points the app at a cached synthetic
+database (see benchmarks/synthetic_db.py) and times four operations:
+
+    predict_career_match      scoring a user against the catalog
+    generate_learning_path    learning path for one (user, career) pair
+    generate_recommendations  scoring, enrichment and the save
+    get_recommendations       serving the stored set saved above
+
+Cold runs start from a fresh RecommendationEngine with the catalog cache
+invalidated and the pooled connections closed, so they include loading
+the catalog and building the scoring engine (the OS page cache stays
+warm). Warm runs time the same operation for many sampled users. Each
+operation reports p50/p95/p99 latency, SQL statements per call (traced on
+the pooled connection) and peak traced Python memory, taken in a separate
+pass so tracing does not skew the latencies.
+
+    python -m benchmarks.recommendation_bench --careers 1000 10000 100000 --users 100000 \\
+        --output benchmarks/results/latest.json --baseline benchmarks/results/previous.json
+
+With --baseline the run exits with status 1 when a warm p50 or p95 is more
+than --threshold times the baseline's.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import database.models as db
+from benchmarks.synthetic_db import DATA_DIR, ensure_database
+from models.recommendation_engine import RecommendationEngine
+
+OPERATIONS = ('predict_career_match', 'generate_learning_path', 'generate_recommendations', 'get_recommendations')
+PERCENTILES = (50, 95, 99)
+MEMORY_SAMPLES = 20
+
+
+class QueryCounter:
+    """Counts SQL statements run on the current thread's pooled connection.
+
+    The connection is held for the whole block, so every get_db_connection()
+    in the code under test reuses it and passes through the trace callback.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.conn = None
+
+    def trace(self, statement):
+        self.count += 1
+
+    def __enter__(self):
+        self.conn = db.get_db_connection()
+        self.conn.set_trace_callback(self.trace)
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.set_trace_callback(None)
+        self.conn.close()
+        self.conn = None
+
+
+def reset_caches():
+    """Drop the catalog cache and every pooled connection, as in a new worker"""
+    db.career_catalog.invalidate()
+    db.release_thread_connection()
+    db.get_pool().close_all()
+
+
+def sample_ids(table, count, rng):
+    """Random sample of ids from a synthetic table"""
+    with db.db_connection() as conn:
+        ids = [row[0] for row in conn.execute(f'SELECT id FROM {table}')]
+    return rng.sample(ids, min(count, len(ids)))
+
+
+def summarize(latencies):
+    latencies_ms = np.array(latencies) * 1000
+    summary = {'calls': len(latencies)}
+    for percentile in PERCENTILES:
+        summary[f'p{percentile}_ms'] = round(float(np.percentile(latencies_ms, percentile)), 3)
+    summary['mean_ms'] = round(float(latencies_ms.mean()), 3)
+    return summary
+
+
+def operation_call(engine, name, user_id, career_id):
+    if name == 'predict_career_match':
+        return lambda: engine.ml_model.predict_career_match(user_id)
+    if name == 'generate_learning_path':
+        return lambda: engine.ml_model.generate_learning_path(user_id, career_id)
+    if name == 'generate_recommendations':
+        return lambda: engine.generate_recommendations(user_id)
+    return lambda: engine.get_recommendations(user_id)
+
+
+def time_calls(calls, trace_memory=False):
+    """Run calls under a query counter; return (latencies, queries per call, peak MB)"""
+    latencies = []
+    with QueryCounter() as counter:
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            for call in calls:
+                started = time.perf_counter()
+                call()
+                latencies.append(time.perf_counter() - started)
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024 if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+    return latencies, counter.count / max(len(latencies), 1), peak
+
+
+def run_size(careers, users, skills, args):
+    """Benchmark one synthetic database and return its result entry"""
+    path = ensure_database(careers, users, skills, args.seed, args.data_dir, args.rebuild)
+    reset_caches()
+    db.DATABASE_NAME = path
+
+    rng = random.Random(args.seed)
+    user_ids = sample_ids('users', args.samples + args.cold_runs + MEMORY_SAMPLES, rng)
+    career_ids = [rng.choice(sample_ids('careers', 1000, rng)) for _ in user_ids]
+    pairs = list(zip(user_ids, career_ids))
+
+    def new_engine():
+        engine = RecommendationEngine()
+        if args.scoring_mode:
+            engine.ml_model.scoring_mode = args.scoring_mode
+        return engine
+
+    operations = {}
+    for name in OPERATIONS:
+        # Cold: one call per fresh engine, then one more traced for memory
+        cold_latencies = []
+        cold_queries = []
+        for user_id, career_id in pairs[:args.cold_runs]:
+            reset_caches()
+            engine = new_engine()
+            latencies, queries, _ = time_calls([operation_call(engine, name, user_id, career_id)])
+            cold_latencies += latencies
+            cold_queries.append(queries)
+        reset_caches()
+        engine = new_engine()
+        user_id, career_id = pairs[0]
+        _, _, cold_peak = time_calls([operation_call(engine, name, user_id, career_id)], trace_memory=True)
+
+        # Warm: the engine above is now loaded; sample users it has not seen
+        warm_pairs = pairs[args.cold_runs:args.cold_runs + args.samples]
+        latencies, warm_queries, _ = time_calls([operation_call(engine, name, u, c) for u, c in warm_pairs])
+        memory_pairs = pairs[args.cold_runs + args.samples:] or warm_pairs[:MEMORY_SAMPLES]
+        _, _, warm_peak = time_calls([operation_call(engine, name, u, c) for u, c in memory_pairs],
+                                     trace_memory=True)
+
+        operations[name] = {
+            'cold': summarize(cold_latencies),
+            'warm': summarize(latencies),
+            'queries_per_call_cold': round(float(np.mean(cold_queries)), 2),
+            'queries_per_call_warm': round(warm_queries, 2),
+            'peak_memory_mb_cold': round(cold_peak, 3),
+            'peak_memory_mb_warm': round(warm_peak, 3)
+        }
+        print(f"  {name}: cold p50 {operations[name]['cold']['p50_ms']:.2f} ms, "
+              f"warm p50/p95/p99 {operations[name]['warm']['p50_ms']:.2f}/"
+              f"{operations[name]['warm']['p95_ms']:.2f}/{operations[name]['warm']['p99_ms']:.2f} ms, "
+              f"{operations[name]['queries_per_call_warm']:.1f} queries/call")
+
+    reset_caches()
+    return {
+        'careers': careers,
+        'users': users,
+        'skills': skills,
+        'database': os.path.basename(path),
+        'database_mb': round(os.path.getsize(path) / 1024 / 1024, 2),
+        'operations': operations
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare_results(current, baseline, threshold):
+    """Warm p50/p95 latencies more than threshold times the baseline, as messages"""
+    previous = {(entry['careers'], entry['users']): entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in current['results']:
+        old = previous.get((entry['careers'], entry['users']))
+        if old is None:
+            continue
+        for name, stats in entry['operations'].items():
+            old_stats = old['operations'].get(name)
+            if old_stats is None:
+                continue
+            for key in ('p50_ms', 'p95_ms'):
+                before, after = old_stats['warm'][key], stats['warm'][key]
+                if before > 0 and after > before * threshold:
+                    regressions.append(f"{name} ({entry['careers']} careers) warm {key}: "
+                                       f"{before:.2f} -> {after:.2f} ms ({after / before:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the recommendation path on synthetic databases')
+    parser.add_argument('--careers', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--skills', type=int, default=2000)
+    parser.add_argument('--samples', type=int, default=200, help='warm calls per operation')
+    parser.add_argument('--cold-runs', type=int, default=3, help='cold calls per operation')
+    parser.add_argument('--scoring-mode', choices=('pruned', 'retrieval', 'clusters'), default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--rebuild', action='store_true', help='regenerate cached databases')
+    parser.add_argument('--output', default=None, help='write results as JSON to this file')
+    parser.add_argument('--baseline', default=None, help='results JSON to compare warm latencies against')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args()
+
+    database = db.DATABASE_NAME
+    results = []
+    try:
+        for careers in args.careers:
+            print(f"{careers} careers, {args.users} users:")
+            results.append(run_size(careers, args.users, args.skills, args))
+    finally:
+        db.DATABASE_NAME = database
+
+    report = {
+        'benchmark': 'recommendation',
+        'created_at': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'users': args.users,
+            'skills': args.skills,
+            'samples': args.samples,
+            'cold_runs': args.cold_runs,
+            'scoring_mode': args.scoring_mode or os.environ.get('SCORING_MODE', 'pruned'),
+            'seed': args.seed
+        },
+        'results': results,
+        # ru_maxrss is KiB on Linux
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
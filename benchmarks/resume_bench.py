@@ -0,0 +1,242 @@
+"""Resume parsing throughput benchmark.
+
+Runs every resume in the synthetic corpus (benchmarks/resume_corpus.py)
+through ResumeParser and SkillExtractor one stage at a time:
+
+    text_extraction   PDF/DOCX/TXT to text
+    section_finding   line split and section index (ResumeDocument)
+    contact_info      email, phone, LinkedIn and name regexes
+    education         degree regexes over the education section
+    experience        job regexes over the experience section
+    skills_section    skill regexes over the skills section
+    summary           summary lines
+    skill_matching    SkillExtractor.extract_skills
+    skill_levels      SkillExtractor.extract_skill_levels
+
+and reports per-stage latency, resumes/sec overall and per format,
+length and skill density as JSON. Results are compared with the stored
+baseline; a stage whose mean time, or a format whose throughput, is worse
+than --threshold times the baseline fails the run. Baselines are machine
+specific, so refresh them on the machine that runs the check:
+
+    python -m benchmarks.resume_bench --update-baseline
+    python -m benchmarks.resume_bench --output /tmp/resume_bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.resume_corpus import CORPUS_DIR, build_corpus
+from utils.resume_parser import ResumeParser
+from utils.skill_extractor import SkillExtractor
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'resume_parsing.json')
+STAGES = (
+    'text_extraction', 'section_finding', 'contact_info', 'education', 'experience', 'skills_section',
+    'summary', 'skill_matching', 'skill_levels'
+)
+# Stage slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_MS = 0.05
+
+
+def parse_stages(parser, extractor, path):
+    """Parse one resume stage by stage; return ({stage: seconds}, {output: count})"""
+    clock = time.perf_counter
+    timings = {}
+
+    started = clock()
+    text, _ = parser.extract_text_with_pages(path)
+    timings['text_extraction'] = clock() - started
+
+    started = clock()
+    parser.get_document(text)
+    timings['section_finding'] = clock() - started
+
+    started = clock()
+    parser.extract_contact_info(text)
+    timings['contact_info'] = clock() - started
+
+    started = clock()
+    education = parser.extract_education(text)
+    timings['education'] = clock() - started
+
+    started = clock()
+    experience = parser.extract_experience(text)
+    timings['experience'] = clock() - started
+
+    started = clock()
+    section_skills = parser.extract_skills_section(text)
+    timings['skills_section'] = clock() - started
+
+    started = clock()
+    parser.extract_summary(text)
+    timings['summary'] = clock() - started
+
+    started = clock()
+    skills = extractor.extract_skills(text)
+    timings['skill_matching'] = clock() - started
+
+    started = clock()
+    extractor.extract_skill_levels(text, list(skills))
+    timings['skill_levels'] = clock() - started
+
+    found = {
+        'education': len(education),
+        'experience': len(experience),
+        'section_skills': len(section_skills),
+        'skills': len(skills)
+    }
+    return timings, found
+
+
+def stage_summary(seconds):
+    latencies_ms = np.array(seconds) * 1000
+    return {
+        'total_ms': round(float(latencies_ms.sum()), 3),
+        'mean_ms': round(float(latencies_ms.mean()), 4),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 4)
+    }
+
+
+def group_summary(totals):
+    """Throughput of a group of per-resume total times"""
+    return {
+        'resumes': len(totals),
+        'mean_ms': round(float(np.mean(totals)) * 1000, 3),
+        'resumes_per_sec': round(len(totals) / sum(totals), 2)
+    }
+
+
+def run_benchmark(corpus_dir=CORPUS_DIR, count=90, seed=0, repeat=3):
+    """Time every stage over the corpus repeat times and return the report"""
+    manifest = build_corpus(corpus_dir, count, seed)
+    parser = ResumeParser()
+    extractor = SkillExtractor()
+
+    # Warm imports and lazy initialization on one resume of each format
+    warmed = set()
+    for resume in manifest['resumes']:
+        if resume['format'] not in warmed:
+            parse_stages(parser, extractor, os.path.join(corpus_dir, resume['file']))
+            warmed.add(resume['format'])
+
+    stage_seconds = {stage: [] for stage in STAGES}
+    groups = {}
+    found_totals = {}
+    for _ in range(repeat):
+        for resume in manifest['resumes']:
+            timings, found = parse_stages(parser, extractor, os.path.join(corpus_dir, resume['file']))
+            total = sum(timings.values())
+            for stage, seconds in timings.items():
+                stage_seconds[stage].append(seconds)
+            for key in ('format', 'length', 'density'):
+                groups.setdefault(key, {}).setdefault(resume[key], []).append(total)
+            for name, value in found.items():
+                found_totals[name] = found_totals.get(name, 0) + value
+
+    runs = repeat * len(manifest['resumes'])
+    stages = {stage: stage_summary(seconds) for stage, seconds in stage_seconds.items()}
+    overall = sum(summary['total_ms'] for summary in stages.values())
+    for summary in stages.values():
+        summary['share'] = round(summary['total_ms'] / overall, 4) if overall else 0.0
+
+    return {
+        'benchmark': 'resume_parsing',
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': manifest['settings'],
+        'repeat': repeat,
+        'resumes_per_sec': round(runs / (overall / 1000), 2) if overall else None,
+        'stages': stages,
+        'by_format': {name: group_summary(totals) for name, totals in groups['format'].items()},
+        'by_length': {name: group_summary(totals) for name, totals in groups['length'].items()},
+        'by_density': {name: group_summary(totals) for name, totals in groups['density'].items()},
+        # Mean outputs per resume, to tell a speedup from a parser that stopped finding things
+        'found_per_resume': {name: round(value / runs, 2) for name, value in found_totals.items()}
+    }
+
+
+def compare_results(current, baseline, threshold):
+    """Stage means and throughputs worse than threshold times the baseline, as messages"""
+    regressions = []
+    for stage, stats in current['stages'].items():
+        old = baseline['stages'].get(stage)
+        if old is None:
+            continue
+        before, after = old['mean_ms'], stats['mean_ms']
+        if after > before * threshold and after - before > MIN_REGRESSION_MS:
+            regressions.append(f"{stage}: mean {before:.3f} -> {after:.3f} ms ({after / before:.2f}x)")
+
+    for name, stats in current['by_format'].items():
+        old = baseline['by_format'].get(name)
+        if old is None:
+            continue
+        before, after = old['resumes_per_sec'], stats['resumes_per_sec']
+        if after * threshold < before:
+            regressions.append(f"{name} throughput: {before:.1f} -> {after:.1f} resumes/sec")
+    return regressions
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark resume parsing stages on a synthetic corpus')
+    parser.add_argument('--corpus-dir', default=CORPUS_DIR)
+    parser.add_argument('--count', type=int, default=90, help='resumes in the corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the corpus')
+    parser.add_argument('--output', default=None, help='write results as JSON to this file')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args()
+
+    report = run_benchmark(args.corpus_dir, args.count, args.seed, args.repeat)
+
+    print(f"{report['resumes_per_sec']:.1f} resumes/sec over {args.count} resumes x {args.repeat}")
+    for stage, stats in report['stages'].items():
+        print(f"  {stage:16} mean {stats['mean_ms']:8.3f} ms  p95 {stats['p95_ms']:8.3f} ms  "
+              f"{stats['share'] * 100:5.1f}%")
+    for name, stats in report['by_format'].items():
+        print(f"  {name:16} {stats['resumes_per_sec']:8.1f} resumes/sec")
+
+    if args.output:
+        write_report(report, args.output)
+        print(f"Wrote {args.output}")
+
+    if args.update_baseline:
+        write_report(report, args.baseline)
+        print(f"Stored baseline {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to store one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('corpus') != report['corpus']:
+        print(f"Baseline was recorded on a different corpus {baseline.get('corpus')}; not comparing")
+        return
+
+    regressions = compare_results(report, baseline, args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""Synthetic resume corpus for the resume parsing benchmark.
+
+Resumes are generated from a seed in three lengths (number of jobs and
+description lines) and three skill densities (share of description words
+that are known skills, some with level phrases such as "5 years of
+experience with docker"), and written as .txt, .docx (python-docx) and
+.pdf. PDFs are written by hand as uncompressed Helvetica text pages, so
+no PDF writer dependency is needed. A manifest.json records each file's
+format, length and density; a corpus is rebuilt only when its settings
+change.
+
+    python -m benchmarks.resume_corpus --count 90
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import textwrap
+
+import docx
+
+from utils.skill_extractor import SkillExtractor
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'resumes')
+MANIFEST_FILE = 'manifest.json'
+# Bump when generated content changes so cached corpora are rebuilt
+CORPUS_VERSION = 1
+
+FORMATS = ('txt', 'docx', 'pdf')
+# name: (jobs, description lines per job)
+LENGTHS = {'short': (1, 3), 'medium': (4, 6), 'long': (12, 10)}
+# name: share of description words that are skills
+DENSITIES = {'sparse': 0.05, 'typical': 0.2, 'dense': 0.5}
+
+FIRST_NAMES = ('Ayesha', 'Omar', 'Maria', 'Chen', 'Priya', 'Lucas', 'Fatima', 'Noah', 'Sara', 'Ivan')
+LAST_NAMES = ('Khan', 'Garcia', 'Smith', 'Nguyen', 'Patel', 'Silva', 'Ahmed', 'Brown', 'Rossi', 'Kim')
+TITLES = ('Software Engineer', 'Data Analyst', 'Project Manager', 'Web Developer', 'Marketing Specialist',
+          'Operations Coordinator', 'Product Director', 'Research Analyst', 'Team Lead', 'Senior Developer')
+COMPANIES = ('Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Enterprises',
+             'Hooli', 'Vandelay Imports')
+DEGREES = ('Bachelor of Science in Computer Science', 'Master of Business Administration',
+           'Bachelor of Arts in Design', 'Diploma in Information Technology', 'PhD in Statistics')
+SCHOOLS = ('State University', 'City College', 'Institute of Technology')
+FILLER_WORDS = (
+    'delivered', 'improved', 'built', 'designed', 'reporting', 'customers', 'team', 'platform', 'reduced',
+    'costs', 'across', 'regional', 'launch', 'quarterly', 'pipeline', 'features', 'stakeholders', 'with',
+    'for', 'the', 'and', 'new', 'internal', 'services', 'processes', 'weekly', 'metrics', 'support'
+)
+LEVEL_PHRASES = (
+    'expert in {skill}', 'advanced {skill}', 'proficient with {skill}', 'basic {skill}',
+    '{years} years of experience with {skill}', 'familiar with {skill}'
+)
+PDF_LINES_PER_PAGE = 54
+
+
+def skill_vocabulary():
+    """Skill names the extractor knows, so generated resumes exercise its matcher"""
+    return [skill for skills in SkillExtractor().skill_database.values() for skill in skills]
+
+
+def description_line(rng, skills, density):
+    words = []
+    for _ in range(rng.randint(10, 16)):
+        if rng.random() < density:
+            skill = rng.choice(skills)
+            if rng.random() < 0.2:
+                skill = rng.choice(LEVEL_PHRASES).format(skill=skill, years=rng.randint(1, 8))
+            words.append(skill)
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+    return ' '.join(words).capitalize() + '.'
+
+
+def generate_resume(rng, skills, length, density):
+    """Lines of one synthetic resume"""
+    jobs, job_lines = LENGTHS[length]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f'{first} {last}',
+        f'Email: {first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com',
+        f'Phone: +1 {rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}',
+        f'linkedin.com/in/{first.lower()}-{last.lower()}',
+        '',
+        'Summary'
+    ]
+    lines += textwrap.wrap(description_line(rng, skills, DENSITIES[density]), 90)
+
+    lines += ['', 'Education']
+    graduated = rng.randint(1995, 2020)
+    for offset in range(1 + (length == 'long')):
+        lines.append(f'{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} {graduated - offset * 4}')
+
+    lines += ['', 'Experience']
+    year = graduated
+    for _ in range(jobs):
+        end = min(year + rng.randint(1, 4), 2025)
+        lines.append(f'{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({year} - {end if end < 2025 else "Present"})')
+        for _ in range(job_lines):
+            lines += textwrap.wrap(description_line(rng, skills, DENSITIES[density]), 90,
+                                   initial_indent='• ', subsequent_indent='  ')
+        year = end
+
+    lines += ['', 'Skills']
+    skill_count = {'sparse': 4, 'typical': 10, 'dense': 20}[density]
+    lines += ['• ' + skill.title() for skill in rng.sample(skills, skill_count)]
+
+    lines += ['', 'Certifications', f'{rng.choice(skills).title()} Certification - Online Academy ({graduated + 2})']
+    return lines
+
+
+def write_txt(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def write_docx(path, lines):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def pdf_string(line):
+    """A line as a PDF literal string in WinAnsiEncoding"""
+    data = line.encode('cp1252', errors='replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def write_pdf(path, lines, lines_per_page=PDF_LINES_PER_PAGE):
+    """Write lines as a minimal multi-page text PDF"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    # 1: catalog, 2: page tree, 3: font, then a page and a content stream per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % i for i in page_ids) + b'] /Count %d >>' % len(pages),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = b'BT /F1 10 Tf 14 TL 50 800 Td\n' + b''.join(pdf_string(line) + b' Tj T*\n' for line in page_lines) + b'ET'
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (page_id + 1))
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+WRITERS = {'txt': write_txt, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def build_corpus(corpus_dir=CORPUS_DIR, count=90, seed=0):
+    """Generate count resumes, cycling through every format, length and density"""
+    settings = {'version': CORPUS_VERSION, 'count': count, 'seed': seed}
+    manifest_path = os.path.join(corpus_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest['settings'] == settings:
+            return manifest
+    except (OSError, ValueError, KeyError):
+        pass
+
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    os.makedirs(corpus_dir)
+    rng = random.Random(seed)
+    skills = skill_vocabulary()
+    combinations = [(file_format, length, density)
+                    for length in LENGTHS for density in DENSITIES for file_format in FORMATS]
+
+    resumes = []
+    for i in range(count):
+        file_format, length, density = combinations[i % len(combinations)]
+        lines = generate_resume(rng, skills, length, density)
+        name = f'resume_{i:04d}_{length}_{density}.{file_format}'
+        WRITERS[file_format](os.path.join(corpus_dir, name), lines)
+        resumes.append({'file': name, 'format': file_format, 'length': length, 'density': density})
+
+    manifest = {'settings': settings, 'resumes': resumes}
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic resume corpus')
+    parser.add_argument('--corpus-dir', default=CORPUS_DIR)
+    parser.add_argument('--count', type=int, default=90)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = build_corpus(args.corpus_dir, args.count, args.seed)
+    print(f"{len(manifest['resumes'])} resumes in {args.corpus_dir}")
+
+
+if __name__ == '__main__':
+    main()
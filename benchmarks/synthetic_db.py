@@ -0,0 +1,212 @@
+"""Synthetic SQLite databases for benchmarks.
+
+Builds a database with the app's full schema (via init_db) and fills the
+careers, skills, career_skills, users, user_skills and assessments tables
+at a requested size. Skill popularity is Zipf-like, so a few skills are
+shared by many careers and users as in real data. Databases are cached by
+size and seed and rebuilt only on request.
+
+Usage:
+    python -m benchmarks.synthetic_db --careers 10000 --users 100000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+import database.models as db
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+BATCH_SIZE = 10000
+
+INDUSTRIES = ('Technology', 'Finance', 'Healthcare', 'Business', 'Arts', 'Marketing', 'Education', 'Engineering')
+EDUCATION_LEVELS = ('High School', 'Diploma', 'Associate', 'Bachelor', 'Master', 'PhD')
+EXPERIENCE_REQUIREMENTS = ('0-1 years', '0-2 years', '1-3 years', '2-4 years', '3-5 years', '5+ years', '7+ years', None)
+DESCRIPTION_WORDS = (
+    'data', 'design', 'cloud', 'security', 'finance', 'health', 'teaching', 'research', 'sales',
+    'software', 'analysis', 'management', 'marketing', 'operations', 'engineering', 'creative'
+)
+FIELDS = ('Science', 'Engineering', 'Business', 'Arts', 'Law', 'Computer Science')
+SKILL_CATEGORIES = ('Technical', 'Soft', 'Domain-specific')
+
+
+def database_path(careers, users, skills, seed, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f'synthetic-c{careers}-u{users}-s{skills}-seed{seed}.db')
+
+
+def batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def skill_sampler(rng, n_skills):
+    """Return sample(count) drawing distinct skill ids with Zipf-like popularity"""
+    weights = 1.0 / np.arange(1, n_skills + 1) ** 0.8
+    cumulative = np.cumsum(weights / weights.sum())
+
+    def sample(count):
+        count = min(count, n_skills)
+        chosen = set()
+        while len(chosen) < count:
+            draws = np.searchsorted(cumulative, rng.random(count * 2))
+            chosen.update(int(draw) for draw in draws[:count - len(chosen)])
+        return list(chosen)
+
+    return sample
+
+
+def build_database(path, careers, users, skills=2000, skills_per_career=(3, 12), skills_per_user=(2, 15),
+                   seed=0):
+    """Create a synthetic database at path and return its row counts"""
+    rng = np.random.default_rng(seed)
+    staging = f'{path}.tmp{os.getpid()}'
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(staging + suffix):
+            os.remove(staging + suffix)
+
+    # Schema, migrations and the sample rows come from the app itself
+    previous = db.DATABASE_NAME
+    db.DATABASE_NAME = staging
+    try:
+        db.init_db()
+        db.get_pool(staging).close_all()
+    finally:
+        db.DATABASE_NAME = previous
+
+    conn = sqlite3.connect(staging)
+    conn.execute('PRAGMA synchronous = OFF')
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM skills')
+    first_skill = cursor.fetchone()[0] + 1
+    for batch in batched((f'Synthetic Skill {i}', SKILL_CATEGORIES[i % 3], round(float(rng.random()), 2))
+                         for i in range(skills)):
+        cursor.executemany('INSERT INTO skills (skill_name, category, importance_score) VALUES (?, ?, ?)', batch)
+    conn.commit()
+    sample_skills = skill_sampler(rng, skills)
+
+    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM careers')
+    first_career = cursor.fetchone()[0] + 1
+
+    def career_rows():
+        for i in range(careers):
+            salary_min = int(rng.integers(30, 120)) * 1000
+            yield (
+                f'Synthetic Career {i}', INDUSTRIES[int(rng.integers(len(INDUSTRIES)))],
+                ' '.join(rng.choice(DESCRIPTION_WORDS, 3, replace=False)),
+                salary_min, salary_min + int(rng.integers(10, 80)) * 1000, round(float(rng.random()) * 0.2, 3),
+                EDUCATION_LEVELS[int(rng.integers(len(EDUCATION_LEVELS)))],
+                EXPERIENCE_REQUIREMENTS[int(rng.integers(len(EXPERIENCE_REQUIREMENTS)))],
+                int(rng.integers(2)), round(float(rng.random()), 3)
+            )
+
+    for batch in batched(career_rows()):
+        cursor.executemany('''
+            INSERT INTO careers (career_title, industry, description, avg_salary_min, avg_salary_max,
+                                 growth_rate, education_required, experience_required, remote_friendly, demand_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+    conn.commit()
+
+    def career_skill_rows():
+        for i in range(careers):
+            for skill in sample_skills(int(rng.integers(skills_per_career[0], skills_per_career[1] + 1))):
+                yield first_career + i, first_skill + skill, int(rng.integers(1, 6)), int(rng.integers(1, 6))
+
+    for batch in batched(career_skill_rows()):
+        cursor.executemany('''
+            INSERT INTO career_skills (career_id, skill_id, importance_level, required_proficiency)
+            VALUES (?, ?, ?, ?)
+        ''', batch)
+    conn.commit()
+
+    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM users')
+    first_user = cursor.fetchone()[0] + 1
+
+    def user_rows():
+        for i in range(users):
+            yield (
+                f'Synthetic User {i}', f'synthetic{i}@benchmark.invalid', int(rng.integers(18, 60)),
+                EDUCATION_LEVELS[int(rng.integers(len(EDUCATION_LEVELS)))],
+                FIELDS[int(rng.integers(len(FIELDS)))], int(rng.integers(0, 20)), 'Region A'
+            )
+
+    for batch in batched(user_rows()):
+        cursor.executemany('''
+            INSERT INTO users (name, email, age, education_level, current_field, years_experience, location)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+    conn.commit()
+
+    def user_skill_rows():
+        for i in range(users):
+            for skill in sample_skills(int(rng.integers(skills_per_user[0], skills_per_user[1] + 1))):
+                yield first_user + i, first_skill + skill, int(rng.integers(1, 6)), 'synthetic'
+
+    def assessment_rows():
+        for i in range(users):
+            interests = list(rng.choice(DESCRIPTION_WORDS, int(rng.integers(0, 3)), replace=False))
+            yield (first_user + i, json.dumps(interests), 'Collaborative', 'Grow',
+                   int(rng.integers(1, 6)), int(rng.integers(1, 6)), int(rng.integers(1, 6)))
+
+    for batch in batched(user_skill_rows()):
+        cursor.executemany('''
+            INSERT INTO user_skills (user_id, skill_id, proficiency_level, source) VALUES (?, ?, ?, ?)
+        ''', batch)
+    for batch in batched(assessment_rows()):
+        cursor.executemany('''
+            INSERT INTO assessments (user_id, interests, work_style_preferences, career_goals,
+                                     risk_tolerance, work_life_balance_priority, salary_importance)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+    conn.commit()
+
+    counts = {table: cursor.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+              for table in ('careers', 'skills', 'career_skills', 'users', 'user_skills', 'assessments')}
+    cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    cursor.execute('ANALYZE')
+    conn.close()
+
+    os.replace(staging, path)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(staging + suffix):
+            os.remove(staging + suffix)
+    return counts
+
+
+def ensure_database(careers, users, skills=2000, seed=0, data_dir=DATA_DIR, rebuild=False):
+    """Path of a cached synthetic database of this size, building it if needed"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = database_path(careers, users, skills, seed, data_dir)
+    if rebuild or not os.path.exists(path):
+        started = time.perf_counter()
+        counts = build_database(path, careers, users, skills, seed=seed)
+        print(f"Built {os.path.basename(path)} in {time.perf_counter() - started:.1f}s: "
+              + ', '.join(f'{count} {table}' for table, count in counts.items()))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic benchmark database')
+    parser.add_argument('--careers', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--skills', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--rebuild', action='store_true')
+    args = parser.parse_args()
+
+    print(ensure_database(args.careers, args.users, args.skills, args.seed, args.data_dir, args.rebuild))
+
+
+if __name__ == '__main__':
+    main()
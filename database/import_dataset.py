@@ -0,0 +1,435 @@
+"""Streaming importer for the multi-sheet career recommendation dataset.
+
+data/Career_Reccomendation Dataset.csv holds six logical sheets in one
+file, each introduced by a "# Sheet N: <title>" marker row followed by its
+header. The file is read once with csv.reader; rows are parsed per sheet
+and written in batched transactions with upserts keyed on the dataset's
+own ids (careers.external_id, skills.external_id, ...), so re-importing
+the same file changes nothing and memory use does not grow with file size.
+
+Several columns hold unquoted comma-separated lists (a career's
+required_skills, a user's skills and interests), so those rows are parsed
+from both ends around the variable-length part.
+
+Usage:
+    python -m database.import_dataset "data/Career_Reccomendation Dataset.csv"
+"""
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import time
+
+from database.models import init_db, get_db_connection
+
+DEFAULT_DATASET = 'data/Career_Reccomendation Dataset.csv'
+BATCH_SIZE = 1000
+# Required proficiency for career skills listed only on the careers sheet
+DEFAULT_REQUIRED_PROFICIENCY = 3
+
+SHEET_MARKER = '# Sheet'
+# Checked in order against the lowercased marker title
+SHEET_TITLES = (
+    ('career-skills', 'career_skills'),
+    ('career', 'careers'),
+    ('skills', 'skills'),
+    ('user', 'users'),
+    ('trend', 'market_trends'),
+    ('learning', 'learning_resources')
+)
+
+USER_SKILL_PATTERN = re.compile(r'^(.+):(\d+)$')
+
+
+def sheet_name(marker):
+    """Map a "# Sheet N: <title>" marker to the sheet it introduces, or None"""
+    title = marker.split(':', 1)[-1].lower()
+    for keyword, name in SHEET_TITLES:
+        if keyword in title:
+            return name
+    return None
+
+
+def trim(fields):
+    """Strip whitespace and drop the trailing empty columns every row is padded with"""
+    fields = [field.strip() for field in fields]
+    while fields and not fields[-1]:
+        fields.pop()
+    return fields
+
+
+def iter_sheet_rows(path):
+    """Yield (sheet, fields) for every data row, reading the file once"""
+    sheet = None
+    header = None
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for fields in csv.reader(f):
+            fields = trim(fields)
+            if not fields or fields[0].startswith('```'):
+                continue
+            if fields[0].startswith(SHEET_MARKER):
+                sheet = sheet_name(fields[0])
+                if sheet is None:
+                    print(f"Error: unknown sheet {fields[0]!r}, skipping its rows")
+                header = None
+                continue
+            if sheet is None:
+                continue
+            if header is None:
+                header = fields
+                continue
+            yield sheet, fields
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_int(value):
+    number = to_float(value)
+    return int(number) if number is not None else None
+
+
+def to_level(value):
+    """Clamp a 1-5 rating; None when missing or not a number"""
+    level = to_int(value)
+    return min(5, max(1, level)) if level is not None else None
+
+
+def column(fields, index):
+    """Field at index, or None when the row is short or the field empty"""
+    return fields[index] or None if index < len(fields) else None
+
+
+def parse_skill_levels(value):
+    """Parse "Python:0.9;Data Analysis:0.8" into [(skill, importance 1-5)]"""
+    levels = []
+    for item in value.split(';'):
+        name, _, weight = item.rpartition(':')
+        weight = to_float(weight)
+        if not name.strip() or weight is None:
+            continue
+        # Weights are given on a 0-1 scale; career_skills stores 1-5
+        level = round(1 + weight * 4) if weight <= 1 else weight
+        levels.append((name.strip(), min(5, max(1, int(level)))))
+    return levels
+
+
+def parse_career(fields):
+    if len(fields) < 11 or not fields[0] or not fields[1]:
+        return None
+
+    # required_skills spans a variable number of columns; the
+    # skill_importance_levels column after it is the first with "name:weight"
+    rest = fields[11:]
+    levels_at = next((i for i, field in enumerate(rest) if ':' in field), None)
+    if levels_at is None:
+        required = rest[:-3] if len(rest) > 3 else rest
+        skill_levels = [(name, 3) for name in required if name]
+    else:
+        skill_levels = parse_skill_levels(rest[levels_at])
+        weighted = {name for name, _ in skill_levels}
+        skill_levels += [(name, 3) for name in rest[:levels_at] if name and name not in weighted]
+
+    return {
+        'external_id': fields[0],
+        'values': (
+            fields[1], column(fields, 2), column(fields, 3), to_int(column(fields, 4)),
+            to_int(column(fields, 5)), to_float(column(fields, 6)), column(fields, 7),
+            column(fields, 8), to_int(column(fields, 9)) or 0, to_float(column(fields, 10))
+        ),
+        'skills': skill_levels
+    }
+
+
+def parse_skill(fields):
+    if len(fields) < 2 or not fields[0] or not fields[1]:
+        return None
+    return (fields[0], fields[1], column(fields, 2), to_float(column(fields, 3)))
+
+
+def parse_career_skill(fields):
+    if len(fields) < 3 or not fields[1] or not fields[2]:
+        return None
+    return (to_level(column(fields, 3)), to_level(column(fields, 4)), fields[1], fields[2])
+
+
+def parse_user(fields):
+    if len(fields) < 6 or not fields[0]:
+        return None
+
+    # skills ("Python:4", ...) follow the six fixed columns; the last five
+    # columns are fixed again, and interests fill whatever lies between
+    skills = []
+    position = 6
+    while position < len(fields):
+        match = USER_SKILL_PATTERN.match(fields[position])
+        if not match:
+            break
+        skills.append((match.group(1).strip(), to_level(match.group(2))))
+        position += 1
+
+    tail = fields[position:]
+    fixed = tail[-5:] if len(tail) >= 5 else tail + [''] * (5 - len(tail))
+    interests = [interest for interest in tail[:-5] if interest]
+
+    external_id = fields[0]
+    return {
+        'external_id': external_id,
+        'values': (
+            f'Dataset user {external_id}', f'{external_id.lower()}@dataset.invalid', to_int(fields[1]),
+            column(fields, 2), column(fields, 3), to_int(column(fields, 4)), column(fields, 5)
+        ),
+        'skills': skills,
+        'assessment': (
+            json.dumps(interests), fixed[1] or None, fixed[0] or None,
+            to_level(fixed[2]), to_level(fixed[3]), to_level(fixed[4])
+        )
+    }
+
+
+def parse_market_trend(fields):
+    if len(fields) < 2 or not fields[1]:
+        return None
+    return (to_float(column(fields, 3)), column(fields, 4), to_float(column(fields, 5)), fields[1])
+
+
+def parse_learning_resource(fields):
+    if len(fields) < 4 or not fields[0] or not fields[3]:
+        return None
+    # A trailing url may itself contain commas
+    url = ','.join(fields[9:]) or None
+    return (
+        fields[0], fields[1], column(fields, 2), fields[3], column(fields, 4), column(fields, 5),
+        to_float(column(fields, 6)), column(fields, 7), to_float(column(fields, 8)), url
+    )
+
+
+def upsert_sql(table, key, columns, values=None):
+    """INSERT ... ON CONFLICT DO UPDATE that leaves unchanged rows alone.
+
+    Skipping no-op updates keeps re-imports from firing the catalog and
+    user input version triggers. values defaults to one placeholder per
+    column and may be a SELECT for rows that resolve foreign keys.
+    """
+    names = ', '.join(columns)
+    values = values or f"VALUES ({', '.join('?' * len(columns))})"
+    updated = [name for name in columns if name not in key]
+    return f'''
+        INSERT INTO {table} ({names}) {values}
+        ON CONFLICT({', '.join(key)}) DO UPDATE SET
+            {', '.join(f'{name} = excluded.{name}' for name in updated)}
+        WHERE ({', '.join(f'{table}.{name}' for name in updated)})
+              IS NOT ({', '.join(f'excluded.{name}' for name in updated)})
+    '''
+
+
+CAREER_COLUMNS = (
+    'external_id', 'career_title', 'industry', 'description', 'avg_salary_min', 'avg_salary_max',
+    'growth_rate', 'education_required', 'experience_required', 'remote_friendly', 'demand_score'
+)
+USER_COLUMNS = (
+    'external_id', 'name', 'email', 'age', 'education_level', 'current_field', 'years_experience', 'location'
+)
+ASSESSMENT_COLUMNS = (
+    'interests', 'work_style_preferences', 'career_goals',
+    'risk_tolerance', 'work_life_balance_priority', 'salary_importance'
+)
+LEARNING_RESOURCE_COLUMNS = (
+    'external_id', 'skill_id', 'resource_type', 'resource_name', 'difficulty_level',
+    'duration', 'cost', 'platform', 'rating', 'url'
+)
+
+
+def load_careers(cursor, records):
+    skill_names = {(name,) for record in records for name, _ in record['skills']}
+    cursor.executemany('INSERT OR IGNORE INTO skills (skill_name) VALUES (?)', sorted(skill_names))
+
+    # Adopt an existing career with the same title (e.g. the sample data)
+    # instead of importing a duplicate
+    cursor.executemany('''
+        UPDATE careers SET external_id = ?
+        WHERE id = (SELECT MIN(id) FROM careers WHERE career_title = ? AND external_id IS NULL)
+          AND NOT EXISTS (SELECT 1 FROM careers WHERE external_id = ?)
+    ''', [(record['external_id'], record['values'][0], record['external_id']) for record in records])
+
+    cursor.executemany(
+        upsert_sql('careers', ('external_id',), CAREER_COLUMNS),
+        [(record['external_id'],) + record['values'] for record in records]
+    )
+
+    # The mapping sheet is authoritative for importance and proficiency, so
+    # the careers sheet only adds pairs that do not exist yet
+    cursor.executemany('''
+        INSERT INTO career_skills (career_id, skill_id, importance_level, required_proficiency)
+        SELECT c.id, s.id, ?, ? FROM careers c, skills s
+        WHERE c.external_id = ? AND s.skill_name = ?
+        ON CONFLICT(career_id, skill_id) DO NOTHING
+    ''', [(level, DEFAULT_REQUIRED_PROFICIENCY, record['external_id'], name)
+          for record in records for name, level in record['skills']])
+
+
+def load_skills(cursor, records):
+    cursor.executemany(
+        upsert_sql('skills', ('skill_name',), ('external_id', 'skill_name', 'category', 'importance_score')),
+        records
+    )
+
+
+def load_career_skills(cursor, records):
+    cursor.executemany(upsert_sql(
+        'career_skills', ('career_id', 'skill_id'),
+        ('career_id', 'skill_id', 'importance_level', 'required_proficiency'),
+        '''SELECT c.id, s.id, ?, ? FROM careers c, skills s
+           WHERE c.external_id = ? AND s.external_id = ?'''
+    ), records)
+
+
+def load_users(cursor, records):
+    cursor.executemany(
+        upsert_sql('users', ('external_id',), USER_COLUMNS),
+        [(record['external_id'],) + record['values'] for record in records]
+    )
+
+    skills = [(name, level, record['external_id']) for record in records for name, level in record['skills']]
+    cursor.executemany('INSERT OR IGNORE INTO skills (skill_name) VALUES (?)', sorted({(name,) for name, _, _ in skills}))
+    cursor.executemany(upsert_sql(
+        'user_skills', ('user_id', 'skill_id'), ('user_id', 'skill_id', 'proficiency_level', 'source'),
+        '''SELECT u.id, s.id, ?, 'dataset' FROM users u, skills s
+           WHERE u.external_id = ? AND s.skill_name = ?'''
+    ), [(level, external_id, name) for name, level, external_id in skills])
+
+    # One assessment per imported user: create it once, then keep it current
+    placeholders = ', '.join('?' * len(ASSESSMENT_COLUMNS))
+    cursor.executemany(f'''
+        INSERT INTO assessments (user_id, {', '.join(ASSESSMENT_COLUMNS)})
+        SELECT u.id, {placeholders} FROM users u
+        WHERE u.external_id = ?
+          AND NOT EXISTS (SELECT 1 FROM assessments a WHERE a.user_id = u.id)
+    ''', [record['assessment'] + (record['external_id'],) for record in records])
+    cursor.executemany(f'''
+        UPDATE assessments SET {', '.join(f'{name} = ?' for name in ASSESSMENT_COLUMNS)}
+        WHERE id = (SELECT MAX(a.id) FROM assessments a JOIN users u ON u.id = a.user_id
+                    WHERE u.external_id = ?)
+          AND ({', '.join(ASSESSMENT_COLUMNS)}) IS NOT ({placeholders})
+    ''', [record['assessment'] + (record['external_id'],) + record['assessment'] for record in records])
+
+
+def load_market_trends(cursor, records):
+    # market_trends keeps one row per skill; the last trend listed for a skill wins
+    records = list({record[-1]: record for record in records}.values())
+    cursor.executemany('''
+        INSERT INTO market_trends (skill_id, trend_score, demand_level, salary_trend)
+        SELECT s.id, ?, ?, ? FROM skills s WHERE s.external_id = ?
+        ON CONFLICT(skill_id) DO UPDATE SET
+            trend_score = excluded.trend_score,
+            demand_level = excluded.demand_level,
+            salary_trend = excluded.salary_trend,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE (market_trends.trend_score, market_trends.demand_level, market_trends.salary_trend)
+              IS NOT (excluded.trend_score, excluded.demand_level, excluded.salary_trend)
+    ''', records)
+
+
+def load_learning_resources(cursor, records):
+    placeholders = ', '.join(['?', '(SELECT id FROM skills WHERE external_id = ?)'] + ['?'] * 8)
+    cursor.executemany(
+        upsert_sql('learning_resources', ('external_id',), LEARNING_RESOURCE_COLUMNS, f'VALUES ({placeholders})'),
+        records
+    )
+
+
+class CountingCursor:
+    """Cursor wrapper adding up the rows each executemany() inserted or updated.
+
+    rowcount excludes rows written by triggers (e.g. the catalog and user
+    input version bumps), so only imported rows are counted.
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.changes = 0
+
+    def executemany(self, sql, rows):
+        self.cursor.executemany(sql, rows)
+        self.changes += max(self.cursor.rowcount, 0)
+
+
+SHEETS = {
+    'careers': (parse_career, load_careers),
+    'skills': (parse_skill, load_skills),
+    'career_skills': (parse_career_skill, load_career_skills),
+    'users': (parse_user, load_users),
+    'market_trends': (parse_market_trend, load_market_trends),
+    'learning_resources': (parse_learning_resource, load_learning_resources)
+}
+
+
+def import_dataset(path, batch_size=BATCH_SIZE, conn=None):
+    """Stream every sheet of the dataset into the database.
+
+    Returns {sheet: {'rows', 'skipped', 'changes'}}, where changes counts
+    rows the sheet's statements inserted or updated in any table, excluding
+    trigger writes (0 when re-importing the same file).
+    """
+    own_connection = conn is None
+    conn = conn or get_db_connection()
+    stats = {}
+    batch = []
+    current = None
+
+    def flush():
+        if not batch:
+            return
+        cursor = CountingCursor(conn.cursor())
+        try:
+            SHEETS[current][1](cursor, batch)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        stats[current]['changes'] += cursor.changes
+        batch.clear()
+
+    try:
+        for sheet, fields in iter_sheet_rows(path):
+            if sheet != current:
+                flush()
+                current = sheet
+                stats.setdefault(sheet, {'rows': 0, 'skipped': 0, 'changes': 0})
+
+            record = SHEETS[sheet][0](fields)
+            if record is None:
+                stats[sheet]['skipped'] += 1
+                continue
+            stats[sheet]['rows'] += 1
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        if own_connection:
+            conn.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import the multi-sheet career recommendation dataset')
+    parser.add_argument('path', nargs='?', default=DEFAULT_DATASET)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='rows per transaction')
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    stats = import_dataset(args.path, args.batch_size)
+    for sheet, counts in stats.items():
+        print(f"{sheet}: {counts['rows']} rows, {counts['skipped']} skipped, {counts['changes']} changes")
+    print(f"Imported {args.path} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
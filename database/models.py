@@ -1,13 +1,174 @@
 import sqlite3
 import json
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
 DATABASE_NAME = 'career_data.db'
 
+# Tables whose writes invalidate the cached career catalog. Skills only
+# matter when a career uses them (see migrate_skill_catalog_triggers), so
+# skills added by resume extraction leave the catalog version alone
+CATALOG_TABLES = ('careers', 'career_skills')
+
+# Applied once to every new connection
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -20000',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA temp_store = MEMORY'
+)
+
+# Idle connections kept per database file
+MAX_IDLE_CONNECTIONS = 8
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.depth = 0
+    
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+    
+    def discard(self):
+        """Really close the underlying connection"""
+        self.pool = None
+        super().close()
+
+class ConnectionPool:
+    """Bounded pool of tuned connections with per-thread reuse.
+    
+    A thread that asks for a connection while it already holds one gets the
+    same connection back, so nested calls within a request share it; the
+    connection returns to the pool when the outermost holder closes it.
+    Code sharing a connection also shares its transaction.
+    """
+    
+    def __init__(self, database, max_idle=MAX_IDLE_CONNECTIONS):
+        self.database = database
+        self.max_idle = max_idle
+        self.pid = os.getpid()
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.created = 0
+        self.reused = 0
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.database, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self.created += 1
+        return conn
+    
+    def acquire(self):
+        """Return this thread's connection, taking one from the pool if needed"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+                if conn is not None:
+                    self.reused += 1
+            if conn is None:
+                conn = self._connect()
+            conn.pool = self
+            self._local.conn = conn
+        conn.depth += 1
+        return conn
+    
+    def release(self, conn, force=False):
+        """Drop one hold on a connection; the last release returns it to the pool"""
+        # Closing an already released connection must not pool it twice
+        if conn.depth <= 0:
+            return
+        conn.depth = 0 if force else conn.depth - 1
+        if conn.depth > 0:
+            return
+        if getattr(self._local, 'conn', None) is conn:
+            self._local.conn = None
+        
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.discard()
+            return
+        
+        with self._lock:
+            if any(idle is conn for idle in self._idle):
+                return
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.discard()
+    
+    def release_thread(self):
+        """Return this thread's connection regardless of unbalanced holds"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self.release(conn, force=True)
+    
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.discard()
+    
+    def stats(self):
+        with self._lock:
+            return {'created': self.created, 'reused': self.reused, 'idle': len(self._idle)}
+
+_pools = {}
+_pools_lock = threading.Lock()
+# Pools inherited across fork; their connections must never be used or closed
+# by the child, so they are only kept referenced
+_inherited_pools = []
+
+def get_pool(database=None):
+    """Connection pool for a database file (DATABASE_NAME by default)"""
+    database = database or DATABASE_NAME
+    pool = _pools.get(database)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(database)
+            if pool is not None and pool.pid != os.getpid():
+                _inherited_pools.append(pool)
+                pool = None
+            if pool is None:
+                pool = _pools[database] = ConnectionPool(database)
+    return pool
+
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_pool().acquire()
+
+@contextmanager
+def db_connection():
+    """Borrow the current thread's pooled connection for the duration of a block"""
+    conn = get_db_connection()
+    try:
+        yield conn
+    except Exception:
+        # Don't leave a failed block's writes for a later commit on the shared connection
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def release_thread_connection():
+    """Return any connection still held by this thread, e.g. at the end of a request"""
+    get_pool().release_thread()
 
 def init_db():
     conn = get_db_connection()
@@ -149,8 +310,68 @@ def init_db():
         )
     ''')
     
+    # Stored resume uploads and their owners
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS resume_files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            file_path TEXT NOT NULL,
+            content_hash TEXT,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(user_id, file_path)
+        )
+    ''')
+    
+    # Parsed resumes and extracted skills keyed by file content hash
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS resume_cache (
+            content_hash TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            version TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (content_hash, stage, version)
+        )
+    ''')
+    
+    # Checkpoint log for bulk resume ingestion runs
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS resume_ingestion_log (
+            run_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            status TEXT NOT NULL,
+            page_count INTEGER,
+            skill_count INTEGER,
+            error TEXT,
+            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_name, file_path)
+        )
+    ''')
+    
+    # Catalog version counter, bumped by triggers on every catalog write
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK(id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)')
+    
+    for table in CATALOG_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_catalog_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+    
     conn.commit()
     
+    apply_migrations(conn)
+    
     # Insert sample data if tables are empty
     cursor.execute('SELECT COUNT(*) FROM skills')
     if cursor.fetchone()[0] == 0:
@@ -159,6 +380,315 @@ def init_db():
     
     conn.close()
 
+def add_column_if_missing(cursor, table, column, definition):
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+def migrate_resume_file_hashes(cursor):
+    # Databases created before content hashing need the column added
+    add_column_if_missing(cursor, 'resume_files', 'content_hash', 'TEXT')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resume_files_content_hash ON resume_files (content_hash)')
+
+# Tables whose writes change a user's recommendation inputs, with the column
+# holding the user id
+USER_INPUT_TABLES = (('users', 'id'), ('user_skills', 'user_id'), ('assessments', 'user_id'))
+
+def migrate_recommendation_fingerprints(cursor):
+    # Per-user input version, bumped by triggers like the catalog version
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_input_version (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table, user_column in USER_INPUT_TABLES:
+        events = ('UPDATE',) if table == 'users' else ('INSERT', 'UPDATE', 'DELETE')
+        for event in events:
+            row = 'OLD' if event == 'DELETE' else 'NEW'
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_user_input_version
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO user_input_version (user_id, version) VALUES ({row}.{user_column}, 1)
+                    ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+                END
+            ''')
+    
+    # Fingerprint of the inputs each user's stored recommendations were computed from
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS recommendation_state (
+            user_id INTEGER PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    
+    # Score breakdown so stored rows can be served without rescoring
+    add_column_if_missing(cursor, 'recommendations', 'match_breakdown', 'TEXT')
+
+# Tables keyed by the source dataset's own ids (C001, S001, U001, ...)
+EXTERNAL_ID_TABLES = ('careers', 'skills', 'users')
+
+def migrate_dataset_import(cursor):
+    for table in EXTERNAL_ID_TABLES:
+        add_column_if_missing(cursor, table, 'external_id', 'TEXT')
+        cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_external_id ON {table} (external_id)')
+    
+    # One row per career and skill, so imports can upsert; keep the newest duplicate
+    cursor.execute('''
+        DELETE FROM career_skills
+        WHERE id NOT IN (SELECT MAX(id) FROM career_skills GROUP BY career_id, skill_id)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_career_skills_career_skill
+        ON career_skills (career_id, skill_id)
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS learning_resources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            external_id TEXT UNIQUE,
+            skill_id INTEGER,
+            resource_type TEXT,
+            resource_name TEXT NOT NULL,
+            difficulty_level TEXT,
+            duration TEXT,
+            cost REAL,
+            platform TEXT,
+            rating REAL,
+            url TEXT,
+            FOREIGN KEY (skill_id) REFERENCES skills (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_learning_resources_skill ON learning_resources (skill_id)')
+
+def migrate_skill_catalog_triggers(cursor):
+    # Only renaming or deleting a skill some career requires changes the catalog
+    for event in ('insert', 'update', 'delete'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS skills_{event}_catalog_version')
+    for event in ('UPDATE OF skill_name', 'DELETE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS skills_{event.split()[0].lower()}_catalog_version
+            AFTER {event} ON skills
+            WHEN EXISTS (SELECT 1 FROM career_skills WHERE skill_id = OLD.id)
+            BEGIN
+                UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+            END
+        ''')
+
+# Schema migrations as (version, description, steps); a step is SQL or a
+# function taking a cursor. PRAGMA user_version records the last one applied.
+MIGRATIONS = [
+    (1, 'resume file content hashes', [migrate_resume_file_hashes]),
+    (2, 'indexes for hot access paths', [
+        # Learning paths and catalog loads read a career's skills by importance
+        '''CREATE INDEX IF NOT EXISTS idx_career_skills_career
+           ON career_skills (career_id, importance_level DESC, skill_id, required_proficiency)''',
+        # Dashboards list a user's best recommendations
+        '''CREATE INDEX IF NOT EXISTS idx_recommendations_user_score
+           ON recommendations (user_id, match_score DESC)''',
+        # Scoring reads each user's latest assessment
+        '''CREATE INDEX IF NOT EXISTS idx_assessments_user_completed
+           ON assessments (user_id, completed_at DESC)''',
+        # One trend row per skill, so INSERT OR REPLACE upserts; keep the newest duplicate
+        '''DELETE FROM market_trends
+           WHERE id NOT IN (SELECT MAX(id) FROM market_trends GROUP BY skill_id)''',
+        '''CREATE UNIQUE INDEX IF NOT EXISTS idx_market_trends_skill
+           ON market_trends (skill_id)'''
+    ]),
+    (3, 'recommendation input fingerprints', [migrate_recommendation_fingerprints]),
+    (4, 'model version on recommendations', [
+        lambda cursor: add_column_if_missing(cursor, 'recommendations', 'model_version', 'TEXT')
+    ]),
+    (5, 'dataset import keys and learning resources', [migrate_dataset_import]),
+    (6, 'catalog version ignores skills no career uses', [migrate_skill_catalog_triggers])
+]
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def apply_migrations(conn, migrations=None):
+    """Apply pending migrations, each in its own transaction; returns the schema version"""
+    migrations = MIGRATIONS if migrations is None else migrations
+    if conn.in_transaction:
+        conn.commit()
+    
+    current = get_schema_version(conn)
+    for version, description, steps in migrations:
+        if version <= current:
+            continue
+        cursor = conn.cursor()
+        # Explicit BEGIN so DDL is rolled back together with the rest on failure
+        cursor.execute('BEGIN')
+        try:
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error applying migration {version} ({description}): {e}")
+            raise
+        current = version
+    
+    return current
+
+# Hot queries and the index each is expected to use
+HOT_QUERIES = {
+    'career_skills_by_career': (
+        '''SELECT s.skill_name, cs.required_proficiency, cs.importance_level
+           FROM career_skills cs JOIN skills s ON cs.skill_id = s.id
+           WHERE cs.career_id = ? ORDER BY cs.importance_level DESC''',
+        (1,), 'idx_career_skills_career'
+    ),
+    'recommendations_by_user': (
+        '''SELECT * FROM recommendations WHERE user_id = ?
+           ORDER BY match_score DESC LIMIT 5''',
+        (1,), 'idx_recommendations_user_score'
+    ),
+    'latest_assessment': (
+        '''SELECT * FROM assessments WHERE user_id = ?
+           ORDER BY completed_at DESC LIMIT 1''',
+        (1,), 'idx_assessments_user_completed'
+    ),
+    'market_trend_by_skill': (
+        'SELECT trend_score FROM market_trends WHERE skill_id = ?',
+        (1,), 'idx_market_trends_skill'
+    )
+}
+
+def explain_query_plan(sql, params=(), conn=None):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    own_connection = conn is None
+    if own_connection:
+        conn = get_db_connection()
+    try:
+        return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()]
+    finally:
+        if own_connection:
+            conn.close()
+
+def check_query_plans(conn=None):
+    """Map each hot query that does not use its expected index to its plan"""
+    problems = {}
+    for name, (sql, params, index_name) in HOT_QUERIES.items():
+        plan = explain_query_plan(sql, params, conn)
+        if not any(index_name in detail for detail in plan):
+            problems[name] = plan
+    return problems
+
+def get_catalog_version(conn=None):
+    """Return the current catalog version counter"""
+    own_connection = conn is None
+    if own_connection:
+        conn = get_db_connection()
+    try:
+        row = conn.execute('SELECT version FROM catalog_version WHERE id = 1').fetchone()
+        return row[0] if row else 0
+    finally:
+        if own_connection:
+            conn.close()
+
+def get_user_data_version(user_id, conn=None):
+    """Return a version string that changes with the catalog or the user's inputs"""
+    own_connection = conn is None
+    if own_connection:
+        conn = get_db_connection()
+    try:
+        row = conn.execute('''
+            SELECT (SELECT version FROM catalog_version WHERE id = 1),
+                   (SELECT version FROM user_input_version WHERE user_id = ?)
+        ''', (user_id,)).fetchone()
+        return f"{row[0] or 0}:{row[1] or 0}"
+    finally:
+        if own_connection:
+            conn.close()
+
+# Catalog career keys used for import and scoring only, never sent to clients
+INTERNAL_CAREER_KEYS = ('external_id', 'required_skill_ids')
+
+def public_career(career):
+    """Copy of a catalog career without its internal keys"""
+    return {key: value for key, value in career.items() if key not in INTERNAL_CAREER_KEYS}
+
+class CareerCatalog:
+    """In-process cache of careers with their parsed required skill lists.
+
+    The catalog is materialized once and reused until the catalog version
+    counter changes. Returned dicts are shared, so callers must copy them
+    before modifying, and pass them through public_career() before
+    returning them to clients.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (version, careers, careers_by_id) swapped atomically on reload
+        self._snapshot = (None, [], {})
+    
+    def _load(self, conn):
+        """Materialize every career with its required skills"""
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM careers ORDER BY id')
+        careers = []
+        careers_by_id = {}
+        for row in cursor.fetchall():
+            career = dict(row)
+            career['required_skills'] = []
+            career['required_skill_ids'] = []
+            careers.append(career)
+            careers_by_id[career['id']] = career
+        
+        cursor.execute('''
+            SELECT cs.career_id, s.id, s.skill_name
+            FROM career_skills cs
+            JOIN skills s ON cs.skill_id = s.id
+            ORDER BY cs.career_id, cs.id
+        ''')
+        for career_id, skill_id, skill_name in cursor.fetchall():
+            if career_id in careers_by_id:
+                careers_by_id[career_id]['required_skills'].append(skill_name)
+                careers_by_id[career_id]['required_skill_ids'].append(skill_id)
+        
+        return careers, careers_by_id
+    
+    def snapshot(self):
+        """Return (version, careers, careers_by_id), reloading if the version changed"""
+        conn = get_db_connection()
+        try:
+            version = get_catalog_version(conn)
+            if version != self._snapshot[0]:
+                with self._lock:
+                    if version != self._snapshot[0]:
+                        careers, careers_by_id = self._load(conn)
+                        self._snapshot = (version, careers, careers_by_id)
+            return self._snapshot
+        finally:
+            conn.close()
+    
+    @property
+    def version(self):
+        return self.snapshot()[0]
+    
+    def careers(self):
+        """All careers ordered by id"""
+        return self.snapshot()[1]
+    
+    def get_career(self, career_id):
+        """A single career by id, or None"""
+        return self.snapshot()[2].get(career_id)
+    
+    def invalidate(self):
+        """Force a reload on next access"""
+        with self._lock:
+            self._snapshot = (None, [], {})
+
+career_catalog = CareerCatalog()
+
 def populate_sample_data(cursor):
     # Sample skills data
     skills_data = [
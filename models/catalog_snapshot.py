@@ -0,0 +1,112 @@
+"""Memory-mapped catalog snapshots for fast worker startup.
+
+The scoring engine's catalog (career ids, feature columns, CSR skill
+matrix, posting lists and career records) is written as one .npy file per
+array under a directory named after the catalog version. Workers map the
+arrays read-only instead of querying and re-parsing the catalog, so every
+process on the host shares a single copy in the page cache.
+
+Build a snapshot for the current catalog (e.g. in the deploy step, before
+starting the workers):
+    python -m models.catalog_snapshot
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+
+import database.models as db
+from models.scoring_engine import CareerScoringEngine
+
+SNAPSHOT_DIR = os.environ.get(
+    'CATALOG_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts', 'catalog')
+)
+METADATA_FILE = 'snapshot.json'
+
+
+def snapshot_path(version, snapshot_dir=None):
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, f'v{version}')
+
+
+def write_snapshot(engine, version, snapshot_dir=None):
+    """Write an engine's arrays for a catalog version and return the snapshot path.
+
+    Files go to a temporary directory that is renamed into place, so
+    readers never see a partial snapshot.
+    """
+    path = snapshot_path(version, snapshot_dir)
+    staging = f'{path}.tmp{os.getpid()}'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    arrays, metadata = engine.to_arrays()
+    for name, values in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(values))
+
+    metadata.update({
+        'catalog_version': version,
+        'database': os.path.abspath(db.DATABASE_NAME),
+        'careers': engine.size,
+        'arrays': sorted(arrays),
+        'created_at': datetime.now().isoformat()
+    })
+    with open(os.path.join(staging, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(staging, path)
+    return path
+
+
+def load_snapshot(version, snapshot_dir=None):
+    """Map the snapshot for a catalog version into a scoring engine.
+
+    Returns None when no snapshot exists for this version and database, so
+    callers can fall back to building the engine from the catalog.
+    """
+    path = snapshot_path(version, snapshot_dir)
+    try:
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        if metadata['database'] != os.path.abspath(db.DATABASE_NAME):
+            return None
+        # Snapshots written before an engine array was added are rebuilt
+        if not set(CareerScoringEngine.ARRAYS) <= set(metadata['arrays']):
+            return None
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                  for name in metadata['arrays']}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error loading catalog snapshot {path}: {e}")
+        return None
+
+    return CareerScoringEngine.from_arrays(arrays, metadata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a memory-mapped snapshot of the career catalog')
+    parser.add_argument('--snapshot-dir', default=None, help=f'output directory (default: {SNAPSHOT_DIR})')
+    args = parser.parse_args()
+
+    db.init_db()
+    started = time.perf_counter()
+    version, careers, _ = db.career_catalog.snapshot()
+    engine = CareerScoringEngine(careers)
+    print(f"Built catalog of {engine.size} careers in {time.perf_counter() - started:.2f}s")
+
+    path = write_snapshot(engine, version, args.snapshot_dir)
+    size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    print(f"Wrote catalog version {version} snapshot to {path} ({size / 1024:.1f} KiB)")
+
+    started = time.perf_counter()
+    load_snapshot(version, args.snapshot_dir)
+    print(f"Snapshot maps in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,32 +4,76 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
+from sklearn.base import clone
+from scipy import sparse
+import joblib
 import json
+import os
+from datetime import datetime
 import pandas as pd
-from database.models import get_db_connection
+from database.models import get_db_connection, db_connection, get_catalog_version, career_catalog
+from models.scoring_engine import (
+    CareerScoringEngine, EDUCATION_HIERARCHY, UNPARSED_EXPERIENCE_SCORE, parse_experience_requirement
+)
+from models.candidate_retrieval import CandidateRetriever, skill_analyzer
+from models.cluster_gate import ClusterGate
+from models.catalog_snapshot import load_snapshot
+from models import training_data
 
 class CareerRecommendationModel:
+    # Keep IN (...) lists below SQLite's bound-parameter limit
+    QUERY_CHUNK_SIZE = 500
+    # Catalogs larger than this are scored over retrieved candidates only
+    CANDIDATE_COUNT = 300
+    # Users sampled to check the cluster gate's recall before it is used
+    CLUSTER_CALIBRATION_USERS = 100
+    # Trained artifacts live in ARTIFACT_DIR/<version>/, LATEST names the newest
+    ARTIFACT_DIR = os.environ.get('MODEL_ARTIFACT_DIR', os.path.join('models', 'artifacts'))
+    ARTIFACT_FILE = 'model.joblib'
+    NUMERIC_FEATURES = ['avg_salary_min', 'avg_salary_max', 'growth_rate', 'demand_score']
+    # Weight of the scaled numeric columns next to the unit-length skill vector
+    NUMERIC_FEATURE_WEIGHT = 0.25
+    
     def __init__(self):
-        self.skill_vectorizer = TfidfVectorizer()
+        # Whole skill names as terms, so retrieval uses the same vocabulary as scoring
+        self.skill_vectorizer = TfidfVectorizer(analyzer=skill_analyzer)
         self.scaler = StandardScaler()
         self.career_clusters = None
         self.career_profiles = None
+        self._scoring_engine = None
+        self._scoring_engine_version = None
+        self._candidate_retriever = None
+        # How catalogs above CANDIDATE_COUNT are scored: 'pruned' (exact),
+        # 'retrieval' (TF-IDF candidates) or 'clusters' (trained cluster gate)
+        self.scoring_mode = os.environ.get('SCORING_MODE', 'pruned')
+        self.cluster_probe = 2
+        self.cluster_explore = 20
+        self._cluster_gate = None
+        # Fitted artifact state
+        self.kmeans = None
+        self.model_version = None
+        self.trained_catalog_version = None
         
     def load_data(self):
         """Load career and user data from database"""
         conn = get_db_connection()
         
-        # Load careers with their required skills
-        careers_query = '''
-            SELECT c.id, c.career_title, c.industry, c.description,
-                   c.avg_salary_min, c.avg_salary_max, c.growth_rate,
-                   c.demand_score, GROUP_CONCAT(s.skill_name) as skills
-            FROM careers c
-            LEFT JOIN career_skills cs ON c.id = cs.career_id
-            LEFT JOIN skills s ON cs.skill_id = s.id
-            GROUP BY c.id
-        '''
-        careers_df = pd.read_sql_query(careers_query, conn)
+        # Load careers with their required skills from the catalog cache
+        careers_df = pd.DataFrame(
+            [{
+                'id': career['id'],
+                'career_title': career['career_title'],
+                'industry': career['industry'],
+                'description': career['description'],
+                'avg_salary_min': career['avg_salary_min'],
+                'avg_salary_max': career['avg_salary_max'],
+                'growth_rate': career['growth_rate'],
+                'demand_score': career['demand_score'],
+                'skills': ','.join(career['required_skills']) or None
+            } for career in career_catalog.careers()],
+            columns=['id', 'career_title', 'industry', 'description', 'avg_salary_min',
+                     'avg_salary_max', 'growth_rate', 'demand_score', 'skills']
+        )
         
         # Load user skills
         users_query = '''
@@ -45,11 +89,148 @@ class CareerRecommendationModel:
         conn.close()
         return careers_df, users_df
     
+    def load_training_dataset(self, csv_path=None):
+        """Labelled student profiles from data/Career Dataset.csv as a compactly typed DataFrame"""
+        return training_data.load_training_dataset(csv_path or training_data.DATASET_PATH)
+    
+    def get_scoring_engine(self):
+        """Return the scoring engine for the current catalog, rebuilding it on catalog change.
+
+        A memory-mapped snapshot of the catalog version is used when one has
+        been built; otherwise the engine is built from the catalog.
+        """
+        version = get_catalog_version()
+        if self._scoring_engine is None or self._scoring_engine_version != version:
+            engine = load_snapshot(version)
+            if engine is None:
+                version, careers, _ = career_catalog.snapshot()
+                engine = CareerScoringEngine(careers)
+            self._scoring_engine = engine
+            self._scoring_engine_version = version
+            self._candidate_retriever = None
+        return self._scoring_engine
+    
+    def get_feature_store(self):
+        """Return the pre-parsed career features for the current catalog"""
+        return self.get_scoring_engine().features
+    
+    def get_candidate_retriever(self):
+        """Return the candidate index for the current scoring engine"""
+        engine = self.get_scoring_engine()
+        retriever = self._candidate_retriever
+        if retriever is None or retriever.engine is not engine:
+            # Fit an unfitted copy so the trained vectorizer is left untouched
+            retriever = CandidateRetriever(engine, clone(self.skill_vectorizer))
+            self._candidate_retriever = retriever
+        return retriever
+    
+    def get_cluster_gate(self):
+        """Return the cluster gate for the current engine and trained model"""
+        engine = self.get_scoring_engine()
+        gate = self._cluster_gate
+        if gate is None or gate.engine is not engine or gate.model_version != self.model_version:
+            gate = ClusterGate(engine, self, self.cluster_probe, self.cluster_explore)
+            gate.calibrate(self.load_user_profiles(self.sample_user_ids(self.CLUSTER_CALIBRATION_USERS)).values())
+            self._cluster_gate = gate
+        return gate
+    
+    def sample_user_ids(self, count):
+        """Ids of up to count of the most recently created users"""
+        with db_connection() as conn:
+            return [row['id'] for row in conn.execute('SELECT id FROM users ORDER BY id DESC LIMIT ?', (count,))]
+    
+    def scoring_stats(self):
+        """Model version, scoring mode and cluster gate work per request"""
+        gate = self._cluster_gate
+        return {
+            'model_version': self.model_version,
+            'scoring_mode': self.scoring_mode,
+            'cluster_gate': gate.metrics() if gate is not None else None
+        }
+    
     def create_skill_vectors(self, text_data):
         """Create TF-IDF vectors for skills"""
         skill_texts = text_data.fillna('').tolist()
         return self.skill_vectorizer.fit_transform(skill_texts)
     
+    def career_feature_matrix(self, careers_df):
+        """Skill TF-IDF vectors joined with scaled numeric columns, one row per career"""
+        skill_vectors = self.skill_vectorizer.transform(careers_df['skills'].fillna(''))
+        numeric = self.scaler.transform(careers_df[self.NUMERIC_FEATURES].fillna(0.0).astype(float))
+        return sparse.hstack([skill_vectors, sparse.csr_matrix(numeric * self.NUMERIC_FEATURE_WEIGHT)]).tocsr()
+    
+    def train(self, n_clusters=8, random_state=42):
+        """Fit the skill vectorizer, numeric scaler and career clusters"""
+        careers_df, users_df = self.load_data()
+        if careers_df.empty:
+            raise ValueError('Cannot train without careers')
+        
+        # Vocabulary covers both career requirements and skills users actually list
+        self.create_skill_vectors(pd.concat([careers_df['skills'], users_df['skills']], ignore_index=True))
+        self.scaler.fit(careers_df[self.NUMERIC_FEATURES].fillna(0.0).astype(float))
+        
+        features = self.career_feature_matrix(careers_df)
+        self.kmeans = KMeans(n_clusters=min(n_clusters, len(careers_df)), n_init=10, random_state=random_state)
+        labels = self.kmeans.fit_predict(features)
+        
+        self.career_profiles = careers_df[['id', 'career_title']].copy()
+        self.career_clusters = dict(zip(careers_df['id'].astype(int), labels.astype(int)))
+        self.trained_catalog_version = get_catalog_version()
+        self.model_version = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-c{self.trained_catalog_version}"
+        self._candidate_retriever = None
+        return self.model_version
+    
+    def save_artifacts(self, artifact_dir=None):
+        """Write the fitted state to a new versioned directory and point LATEST at it"""
+        if self.model_version is None:
+            raise ValueError('Model has not been trained')
+        
+        artifact_dir = artifact_dir or self.ARTIFACT_DIR
+        version_dir = os.path.join(artifact_dir, self.model_version)
+        os.makedirs(version_dir, exist_ok=True)
+        
+        career_ids = np.array(list(self.career_clusters), dtype=np.int64)
+        joblib.dump({
+            'model_version': self.model_version,
+            'catalog_version': self.trained_catalog_version,
+            'trained_at': datetime.now().isoformat(),
+            'skill_vectorizer': self.skill_vectorizer,
+            'scaler': self.scaler,
+            'kmeans': self.kmeans,
+            'career_ids': career_ids,
+            'career_labels': np.array([self.career_clusters[career_id] for career_id in career_ids], dtype=np.int32)
+        }, os.path.join(version_dir, self.ARTIFACT_FILE))
+        
+        # Write the pointer last so readers never see a half-written version
+        latest_tmp = os.path.join(artifact_dir, 'LATEST.tmp')
+        with open(latest_tmp, 'w') as f:
+            f.write(self.model_version)
+        os.replace(latest_tmp, os.path.join(artifact_dir, 'LATEST'))
+        return version_dir
+    
+    def load_artifacts(self, artifact_dir=None, version=None):
+        """Load a trained version (LATEST by default); returns False if none exists"""
+        artifact_dir = artifact_dir or self.ARTIFACT_DIR
+        if version is None:
+            latest_path = os.path.join(artifact_dir, 'LATEST')
+            if not os.path.exists(latest_path):
+                return False
+            with open(latest_path) as f:
+                version = f.read().strip()
+        
+        artifact = joblib.load(os.path.join(artifact_dir, version, self.ARTIFACT_FILE))
+        self.skill_vectorizer = artifact['skill_vectorizer']
+        self.scaler = artifact['scaler']
+        self.kmeans = artifact['kmeans']
+        self.career_clusters = dict(zip(artifact['career_ids'].tolist(), artifact['career_labels'].tolist()))
+        self.model_version = artifact['model_version']
+        self.trained_catalog_version = artifact['catalog_version']
+        self._candidate_retriever = None
+        
+        if self.trained_catalog_version != get_catalog_version():
+            print(f"Model {self.model_version} was trained on an older catalog; retrain to refresh clusters")
+        return True
+    
     def calculate_skill_match_score(self, user_skills, career_skills):
         """Calculate skill match score between user and career"""
         if not user_skills or not career_skills:
@@ -72,17 +253,8 @@ class CareerRecommendationModel:
     
     def calculate_education_match(self, user_education, required_education):
         """Calculate education level compatibility"""
-        education_hierarchy = {
-            'High School': 1,
-            'Diploma': 2,
-            'Associate': 3,
-            'Bachelor': 4,
-            'Master': 5,
-            'PhD': 6
-        }
-        
-        user_level = education_hierarchy.get(user_education, 0)
-        required_level = education_hierarchy.get(required_education, 0)
+        user_level = EDUCATION_HIERARCHY.get(user_education, 0)
+        required_level = EDUCATION_HIERARCHY.get(required_education, 0)
         
         if user_level >= required_level:
             return 1.0
@@ -96,154 +268,191 @@ class CareerRecommendationModel:
         if not required_experience:
             return 1.0
         
-        # Parse required experience (e.g., "2-4 years")
-        if '-' in required_experience:
-            try:
-                min_exp, max_exp = map(int, required_experience.split('-')[0:2])
-                min_exp = int(min_exp)
-                max_exp = int(max_exp.split()[0])
-                
-                if user_experience >= min_exp:
-                    return 1.0
-                elif user_experience >= min_exp - 1:
-                    return 0.8
-                else:
-                    return 0.5
-            except:
-                return 0.7
+        # Parse required experience (e.g., "2-4 years" or "5+ years")
+        min_exp, _ = parse_experience_requirement(required_experience)
+        if min_exp is None:
+            return UNPARSED_EXPERIENCE_SCORE
         
-        return 0.7
+        try:
+            user_experience = float(user_experience or 0)
+        except (TypeError, ValueError):
+            return UNPARSED_EXPERIENCE_SCORE
+        
+        if user_experience >= min_exp:
+            return 1.0
+        elif user_experience >= min_exp - 1:
+            return 0.8
+        else:
+            return 0.5
     
     def predict_career_match(self, user_id):
         """Predict career matches for a specific user"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Get user profile
+            cursor.execute('''
+                SELECT u.*, GROUP_CONCAT(s.skill_name) as skills,
+                       GROUP_CONCAT(us.proficiency_level) as skill_levels
+                FROM users u
+                LEFT JOIN user_skills us ON u.id = us.user_id
+                LEFT JOIN skills s ON us.skill_id = s.id
+                WHERE u.id = ?
+                GROUP BY u.id
+            ''', (user_id,))
+            
+            user_data = cursor.fetchone()
+            if not user_data:
+                return []
+            
+            # Get user assessment data
+            cursor.execute('''
+                SELECT * FROM assessments WHERE user_id = ? 
+                ORDER BY completed_at DESC LIMIT 1
+            ''', (user_id,))
+            assessment = cursor.fetchone()
+        
+        engine = self.get_scoring_engine()
+        profile = self.build_user_profile(user_data, assessment)
+        
+        # Large catalogs: skip careers that cannot reach the top 10, or score
+        # only a candidate subset when approximate results are acceptable
+        if engine.size > self.CANDIDATE_COUNT:
+            if self.scoring_mode == 'clusters' and self.kmeans is not None:
+                return self.get_cluster_gate().top_matches(profile, k=10)
+            if self.scoring_mode == 'retrieval':
+                return self.get_candidate_retriever().top_matches(profile, k=10, n_candidates=self.CANDIDATE_COUNT)
+            return engine.top_matches_pruned(profile, k=10)
+        
+        # Score every career in one vectorized pass
+        return engine.top_matches(profile, k=10)  # Return top 10 matches
+    
+    def build_user_profile(self, user_data, assessment):
+        """Collect the user fields the scoring engine needs"""
+        interests = None
+        if assessment and assessment['interests']:
+            try:
+                interests = set([i.lower() for i in json.loads(assessment['interests'])])
+            except:
+                interests = None
         
-        # Get user profile
-        cursor.execute('''
-            SELECT u.*, GROUP_CONCAT(s.skill_name) as skills,
-                   GROUP_CONCAT(us.proficiency_level) as skill_levels
-            FROM users u
-            LEFT JOIN user_skills us ON u.id = us.user_id
-            LEFT JOIN skills s ON us.skill_id = s.id
-            WHERE u.id = ?
-            GROUP BY u.id
-        ''', (user_id,))
-        
-        user_data = cursor.fetchone()
-        if not user_data:
-            return []
-        
-        # Get user assessment data
-        cursor.execute('''
-            SELECT * FROM assessments WHERE user_id = ? 
-            ORDER BY completed_at DESC LIMIT 1
-        ''', (user_id,))
-        assessment = cursor.fetchone()
-        
-        # Get all careers
-        cursor.execute('''
-            SELECT c.*, GROUP_CONCAT(s.skill_name) as required_skills
-            FROM careers c
-            LEFT JOIN career_skills cs ON c.id = cs.career_id
-            LEFT JOIN skills s ON cs.skill_id = s.id
-            GROUP BY c.id
-        ''')
-        careers = cursor.fetchall()
+        return {
+            'skills': user_data['skills'],
+            'education_level': user_data['education_level'],
+            'years_experience': user_data['years_experience'],
+            'interests': interests
+        }
+    
+    def predict_career_matches(self, user_ids, top_k=10):
+        """Predict career matches for many users in one scoring pass"""
+        profiles = self.load_user_profiles(user_ids)
+        if not profiles:
+            return {}
         
-        conn.close()
+        engine = self.get_scoring_engine()
+        matches = engine.top_matches_batch(list(profiles.values()), k=top_k)
         
-        recommendations = []
+        return dict(zip(profiles, matches))
+    
+    def load_user_profiles(self, user_ids):
+        """Scoring profiles for many users as {user_id: profile}, in the given order"""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
         
-        for career in careers:
-            # Calculate different matching scores
-            skill_score = self.calculate_skill_match_score(
-                user_data['skills'], career['required_skills']
-            )
-            
-            education_score = self.calculate_education_match(
-                user_data['education_level'], career['education_required']
-            )
-            
-            experience_score = self.calculate_experience_match(
-                user_data['years_experience'] or 0, career['experience_required']
-            )
-            
-            # Interest matching (if assessment available)
-            interest_score = 0.7  # Default
-            if assessment and assessment['interests']:
-                try:
-                    interests = json.loads(assessment['interests'])
-                    # Simple keyword matching with career description
-                    if career['description']:
-                        desc_words = set(career['description'].lower().split())
-                        interest_words = set([i.lower() for i in interests])
-                        if desc_words.intersection(interest_words):
-                            interest_score = 0.9
-                except:
-                    pass
-            
-            # Calculate overall match score
-            overall_score = (
-                skill_score * 0.4 +
-                education_score * 0.2 +
-                experience_score * 0.2 +
-                interest_score * 0.1 +
-                career['demand_score'] * 0.1
-            )
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        users = {}
+        assessments = {}
+        for start in range(0, len(user_ids), self.QUERY_CHUNK_SIZE):
+            chunk = user_ids[start:start + self.QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
             
-            # Identify skill gaps
-            user_skills = set(user_data['skills'].split(',')) if user_data['skills'] else set()
-            required_skills = set(career['required_skills'].split(',')) if career['required_skills'] else set()
-            skill_gaps = list(required_skills - user_skills)
+            # Get user profiles
+            cursor.execute(f'''
+                SELECT u.*, GROUP_CONCAT(s.skill_name) as skills
+                FROM users u
+                LEFT JOIN user_skills us ON u.id = us.user_id
+                LEFT JOIN skills s ON us.skill_id = s.id
+                WHERE u.id IN ({placeholders})
+                GROUP BY u.id
+            ''', chunk)
+            for row in cursor.fetchall():
+                users[row['id']] = row
             
-            recommendations.append({
-                'career_id': career['id'],
-                'career_title': career['career_title'],
-                'industry': career['industry'],
-                'description': career['description'],
-                'match_score': round(overall_score, 3),
-                'skill_score': round(skill_score, 3),
-                'education_score': round(education_score, 3),
-                'experience_score': round(experience_score, 3),
-                'interest_score': round(interest_score, 3),
-                'skill_gaps': skill_gaps,
-                'salary_range': f"${career['avg_salary_min']:,} - ${career['avg_salary_max']:,}",
-                'growth_rate': career['growth_rate'],
-                'demand_score': career['demand_score']
-            })
+            # Keep only the latest assessment per user
+            cursor.execute(f'''
+                SELECT * FROM assessments WHERE user_id IN ({placeholders})
+                ORDER BY user_id, completed_at DESC
+            ''', chunk)
+            for row in cursor.fetchall():
+                assessments.setdefault(row['user_id'], row)
         
-        # Sort by match score
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
+        conn.close()
         
-        return recommendations[:10]  # Return top 10 matches
+        return {
+            user_id: self.build_user_profile(users[user_id], assessments.get(user_id))
+            for user_id in user_ids if user_id in users
+        }
     
     def generate_learning_path(self, user_id, career_id):
         """Generate learning path for a specific career"""
+        return self.generate_learning_paths({user_id: [career_id]})[user_id][career_id]
+    
+    def generate_learning_paths(self, user_career_ids):
+        """Generate learning paths for many (user, career) pairs with two queries.
+        
+        Takes {user_id: [career_id, ...]} and returns
+        {user_id: {career_id: learning_path}}. User skills and required skills
+        are loaded once each with IN queries and the paths built in memory.
+        """
+        user_ids = list(user_career_ids)
+        career_ids = list({career_id for ids in user_career_ids.values() for career_id in ids})
+        
+        user_skills = {user_id: {} for user_id in user_ids}
+        required_skills = {career_id: [] for career_id in career_ids}
+        
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get user's current skills
-        cursor.execute('''
-            SELECT s.skill_name, us.proficiency_level
-            FROM user_skills us
-            JOIN skills s ON us.skill_id = s.id
-            WHERE us.user_id = ?
-        ''', (user_id,))
-        user_skills = {row['skill_name']: row['proficiency_level'] for row in cursor.fetchall()}
-        
-        # Get required skills for career
-        cursor.execute('''
-            SELECT s.skill_name, cs.required_proficiency, cs.importance_level
-            FROM career_skills cs
-            JOIN skills s ON cs.skill_id = s.id
-            WHERE cs.career_id = ?
-            ORDER BY cs.importance_level DESC
-        ''', (career_id,))
-        required_skills = cursor.fetchall()
+        # Get users' current skills
+        for start in range(0, len(user_ids), self.QUERY_CHUNK_SIZE):
+            chunk = user_ids[start:start + self.QUERY_CHUNK_SIZE]
+            cursor.execute(f'''
+                SELECT us.user_id, s.skill_name, us.proficiency_level
+                FROM user_skills us
+                JOIN skills s ON us.skill_id = s.id
+                WHERE us.user_id IN ({','.join('?' * len(chunk))})
+            ''', chunk)
+            for row in cursor.fetchall():
+                user_skills[row['user_id']][row['skill_name']] = row['proficiency_level']
+        
+        # Get required skills for every career, most important first
+        for start in range(0, len(career_ids), self.QUERY_CHUNK_SIZE):
+            chunk = career_ids[start:start + self.QUERY_CHUNK_SIZE]
+            cursor.execute(f'''
+                SELECT cs.career_id, s.skill_name, cs.required_proficiency, cs.importance_level
+                FROM career_skills cs
+                JOIN skills s ON cs.skill_id = s.id
+                WHERE cs.career_id IN ({','.join('?' * len(chunk))})
+                ORDER BY cs.career_id, cs.importance_level DESC, cs.skill_id
+            ''', chunk)
+            for row in cursor.fetchall():
+                required_skills[row['career_id']].append(row)
         
         conn.close()
         
+        return {
+            user_id: {
+                career_id: self.build_learning_path(user_skills[user_id], required_skills[career_id])
+                for career_id in ids
+            }
+            for user_id, ids in user_career_ids.items()
+        }
+    
+    def build_learning_path(self, user_skills, required_skills):
+        """Build a learning path from a user's skill levels and a career's required skills"""
         learning_path = []
         
         for skill_data in required_skills:
@@ -1,57 +1,39 @@
 from models.ml_model import CareerRecommendationModel
-from database.models import get_db_connection
+from models.scoring_engine import format_salary_range
+from database.models import get_db_connection, db_connection, get_catalog_version, career_catalog, public_career
 import json
+import time
 from datetime import datetime
 
 class RecommendationEngine:
+    # Bump when scoring or stored recommendation content changes so stored sets are recomputed
+    VERSION = '1'
+    DEFAULT_TOP_K = 10
+    QUERY_CHUNK_SIZE = 500
+    
     def __init__(self):
         self.ml_model = CareerRecommendationModel()
+        # Stats from the most recent bulk recommendation save
+        self.last_write_stats = None
     
     def generate_recommendations(self, user_id):
         """Generate comprehensive career recommendations for a user"""
         try:
-            # Get ML-based recommendations
-            ml_recommendations = self.ml_model.predict_career_match(user_id)
-            
-            # Save recommendations to database
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Clear old recommendations
-            cursor.execute('DELETE FROM recommendations WHERE user_id = ?', (user_id,))
-            
-            enhanced_recommendations = []
-            
-            for rec in ml_recommendations:
-                # Generate learning path
-                learning_path = self.ml_model.generate_learning_path(user_id, rec['career_id'])
+            # One pooled connection serves scoring, learning paths and the save
+            with db_connection() as conn:
+                cursor = conn.cursor()
                 
-                # Generate reasoning
-                reasoning = self.generate_reasoning(rec)
+                # Fingerprint the inputs before reading them, so a concurrent change forces a recompute
+                fingerprints = self.input_fingerprints(cursor, [user_id])
                 
-                # Save to database
-                cursor.execute('''
-                    INSERT INTO recommendations 
-                    (user_id, career_id, match_score, reasoning, skill_gaps, learning_path)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (user_id, rec['career_id'], rec['match_score'], reasoning,
-                      json.dumps(rec['skill_gaps']), json.dumps(learning_path)))
+                # Get ML-based recommendations
+                ml_recommendations = self.ml_model.predict_career_match(user_id)
                 
-                # Enhance recommendation with additional data
-                enhanced_rec = rec.copy()
-                enhanced_rec['reasoning'] = reasoning
-                enhanced_rec['learning_path'] = learning_path
-                enhanced_rec['match_breakdown'] = {
-                    'skill_match': rec['skill_score'],
-                    'education_match': rec['education_score'],
-                    'experience_match': rec['experience_score'],
-                    'interest_match': rec['interest_score']
-                }
+                # Save recommendations to database
+                enhanced_recommendations = self.store_recommendations(cursor, user_id, ml_recommendations)
+                self.record_fingerprints(cursor, fingerprints)
                 
-                enhanced_recommendations.append(enhanced_rec)
-            
-            conn.commit()
-            conn.close()
+                conn.commit()
             
             return enhanced_recommendations
             
@@ -59,6 +41,222 @@ class RecommendationEngine:
             print(f"Error generating recommendations: {e}")
             return []
     
+    def generate_batch_recommendations(self, user_ids, top_k=10):
+        """Generate and save recommendations for a cohort of users in one scoring pass"""
+        try:
+            with db_connection() as conn:
+                fingerprints = self.input_fingerprints(conn.cursor(), user_ids, top_k)
+                
+                ml_recommendations = self.ml_model.predict_career_matches(user_ids, top_k=top_k)
+                
+                learning_paths = self.ml_model.generate_learning_paths({
+                    user_id: [rec['career_id'] for rec in recommendations]
+                    for user_id, recommendations in ml_recommendations.items()
+                })
+                
+                batch_recommendations = {
+                    user_id: self.enhance_recommendations(recommendations, learning_paths[user_id])
+                    for user_id, recommendations in ml_recommendations.items()
+                }
+                
+                self.last_write_stats = self.save_recommendations_bulk(batch_recommendations,
+                                                                       fingerprints=fingerprints)
+            
+            return batch_recommendations
+            
+        except Exception as e:
+            print(f"Error generating batch recommendations: {e}")
+            return {}
+    
+    def get_recommendations(self, user_id):
+        """Serve a user's stored recommendations while their inputs are unchanged, else regenerate"""
+        try:
+            with db_connection() as conn:
+                cursor = conn.cursor()
+                current, stored = self.input_fingerprints(cursor, [user_id]).get(user_id, (None, None))
+                if current is not None and current == stored:
+                    recommendations = self.load_stored_recommendations(cursor, user_id)
+                    if recommendations is not None:
+                        return recommendations
+        except Exception as e:
+            print(f"Error loading stored recommendations: {e}")
+        
+        return self.generate_recommendations(user_id)
+    
+    def refresh_recommendations(self, user_ids, top_k=DEFAULT_TOP_K):
+        """Regenerate recommendations only for users whose inputs changed"""
+        with db_connection() as conn:
+            fingerprints = self.input_fingerprints(conn.cursor(), user_ids, top_k)
+        
+        stale_ids = [user_id for user_id, (current, stored) in fingerprints.items() if current != stored]
+        if stale_ids:
+            self.generate_batch_recommendations(stale_ids, top_k=top_k)
+        
+        return {'users': len(fingerprints), 'refreshed': len(stale_ids)}
+    
+    def input_fingerprints(self, cursor, user_ids, top_k=DEFAULT_TOP_K):
+        """Return {user_id: (current fingerprint, stored fingerprint)}.
+        
+        A fingerprint combines the engine and model versions, top k, the
+        catalog version and the user's input version, which triggers bump on any change to
+        the user's profile, skills or assessments.
+        """
+        catalog_version = get_catalog_version(cursor.connection)
+        user_ids = list(user_ids)
+        fingerprints = {}
+        
+        for start in range(0, len(user_ids), self.QUERY_CHUNK_SIZE):
+            chunk = user_ids[start:start + self.QUERY_CHUNK_SIZE]
+            cursor.execute(f'''
+                SELECT u.id, COALESCE(v.version, 0) AS input_version, rs.fingerprint
+                FROM users u
+                LEFT JOIN user_input_version v ON v.user_id = u.id
+                LEFT JOIN recommendation_state rs ON rs.user_id = u.id
+                WHERE u.id IN ({','.join('?' * len(chunk))})
+            ''', chunk)
+            for row in cursor.fetchall():
+                current = (f"{self.VERSION}:{self.ml_model.model_version}:{top_k}:"
+                           f"{catalog_version}:{row['input_version']}")
+                fingerprints[row['id']] = (current, row['fingerprint'])
+        
+        return fingerprints
+    
+    def record_fingerprints(self, cursor, fingerprints):
+        """Store the input fingerprints saved recommendations were computed from"""
+        cursor.executemany('''
+            INSERT OR REPLACE INTO recommendation_state (user_id, fingerprint, computed_at)
+            VALUES (?, ?, datetime('now'))
+        ''', [(user_id, current) for user_id, (current, _) in fingerprints.items()])
+    
+    def load_stored_recommendations(self, cursor, user_id):
+        """Rebuild saved recommendations in rank order, or None if a career has gone"""
+        cursor.execute('''
+            SELECT career_id, match_score, reasoning, skill_gaps, learning_path, match_breakdown
+            FROM recommendations
+            WHERE user_id = ?
+            ORDER BY match_score DESC, id
+        ''', (user_id,))
+        
+        careers_by_id = career_catalog.snapshot()[2]
+        recommendations = []
+        for row in cursor.fetchall():
+            career = careers_by_id.get(row['career_id'])
+            if not career or not row['match_breakdown']:
+                return None
+            
+            match_breakdown = json.loads(row['match_breakdown'])
+            recommendations.append({
+                'career_id': career['id'],
+                'career_title': career['career_title'],
+                'industry': career['industry'],
+                'description': career['description'],
+                'match_score': row['match_score'],
+                'skill_score': match_breakdown['skill_match'],
+                'education_score': match_breakdown['education_match'],
+                'experience_score': match_breakdown['experience_match'],
+                'interest_score': match_breakdown['interest_match'],
+                'skill_gaps': json.loads(row['skill_gaps']),
+                'salary_range': format_salary_range(career),
+                'growth_rate': career['growth_rate'],
+                'demand_score': career['demand_score'],
+                'reasoning': row['reasoning'],
+                'learning_path': json.loads(row['learning_path']),
+                'match_breakdown': match_breakdown
+            })
+        
+        return recommendations
+    
+    def store_recommendations(self, cursor, user_id, ml_recommendations, learning_paths=None):
+        """Replace a user's saved recommendations and return the enhanced versions"""
+        # Learning paths for every recommended career in one batch
+        if learning_paths is None:
+            career_ids = [rec['career_id'] for rec in ml_recommendations]
+            learning_paths = self.ml_model.generate_learning_paths({user_id: career_ids})[user_id]
+        
+        enhanced_recommendations = self.enhance_recommendations(ml_recommendations, learning_paths)
+        self.write_recommendations(cursor, {user_id: enhanced_recommendations})
+        
+        return enhanced_recommendations
+    
+    def enhance_recommendations(self, ml_recommendations, learning_paths):
+        """Add reasoning, learning paths and the score breakdown to scored matches"""
+        enhanced_recommendations = []
+        
+        for rec in ml_recommendations:
+            enhanced_rec = rec.copy()
+            enhanced_rec['reasoning'] = self.generate_reasoning(rec)
+            enhanced_rec['learning_path'] = learning_paths[rec['career_id']]
+            enhanced_rec['match_breakdown'] = {
+                'skill_match': rec['skill_score'],
+                'education_match': rec['education_score'],
+                'experience_match': rec['experience_score'],
+                'interest_match': rec['interest_score']
+            }
+            
+            enhanced_recommendations.append(enhanced_rec)
+        
+        return enhanced_recommendations
+    
+    def write_recommendations(self, cursor, recommendations_by_user, compact=True):
+        """Replace saved recommendations for many users with two executemany calls.
+        
+        Runs inside the caller's transaction and returns (rows_deleted,
+        rows_written). Compact mode drops JSON whitespace from skill_gaps and
+        learning_path; both forms load the same with json.loads.
+        """
+        separators = (',', ':') if compact else None
+        
+        rows = [
+            (user_id, rec['career_id'], rec['match_score'], rec['reasoning'],
+             json.dumps(rec['skill_gaps'], separators=separators),
+             json.dumps(rec['learning_path'], separators=separators),
+             json.dumps(rec['match_breakdown'], separators=separators),
+             self.ml_model.model_version)
+            for user_id, recommendations in recommendations_by_user.items()
+            for rec in recommendations
+        ]
+        
+        # Clear old recommendations
+        cursor.executemany('DELETE FROM recommendations WHERE user_id = ?',
+                           [(user_id,) for user_id in recommendations_by_user])
+        rows_deleted = cursor.rowcount
+        
+        cursor.executemany('''
+            INSERT INTO recommendations 
+            (user_id, career_id, match_score, reasoning, skill_gaps, learning_path, match_breakdown,
+             model_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        
+        return rows_deleted, len(rows)
+    
+    def save_recommendations_bulk(self, recommendations_by_user, compact=True, fingerprints=None):
+        """Persist enhanced recommendations for many users in one transaction.
+        
+        Takes {user_id: [enhanced recommendation, ...]} and returns write stats.
+        Input fingerprints from input_fingerprints() are recorded alongside.
+        """
+        started = time.perf_counter()
+        
+        with db_connection() as conn:
+            try:
+                rows_deleted, rows_written = self.write_recommendations(
+                    conn.cursor(), recommendations_by_user, compact=compact
+                )
+                if fingerprints:
+                    self.record_fingerprints(conn.cursor(), fingerprints)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        
+        return {
+            'users': len(recommendations_by_user),
+            'rows_deleted': rows_deleted,
+            'rows_written': rows_written,
+            'seconds': time.perf_counter() - started
+        }
+    
     def generate_reasoning(self, recommendation):
         """Generate human-readable reasoning for recommendation"""
         reasoning_parts = []
@@ -202,18 +400,10 @@ class RecommendationEngine:
         comparison_data = []
         
         for career_id in career_ids:
-            cursor.execute('''
-                SELECT c.*, GROUP_CONCAT(s.skill_name) as required_skills
-                FROM careers c
-                LEFT JOIN career_skills cs ON c.id = cs.career_id
-                LEFT JOIN skills s ON cs.skill_id = s.id
-                WHERE c.id = ?
-                GROUP BY c.id
-            ''', (career_id,))
-            
-            career = cursor.fetchone()
+            career = career_catalog.get_career(career_id)
             if career:
-                career_data = dict(career)
+                career_data = public_career(career)
+                career_data['required_skills'] = ','.join(career['required_skills']) or None
                 
                 # Add match score if user provided
                 if user_id:
@@ -0,0 +1,598 @@
+import json
+import re
+import numpy as np
+from scipy import sparse
+from database.models import INTERNAL_CAREER_KEYS
+
+EDUCATION_HIERARCHY = {
+    'High School': 1,
+    'Diploma': 2,
+    'Associate': 3,
+    'Bachelor': 4,
+    'Master': 5,
+    'PhD': 6
+}
+
+SCORE_WEIGHTS = {
+    'skill': 0.4,
+    'education': 0.2,
+    'experience': 0.2,
+    'interest': 0.1,
+    'demand': 0.1
+}
+
+DEFAULT_INTEREST_SCORE = 0.7
+MATCHED_INTEREST_SCORE = 0.9
+UNPARSED_EXPERIENCE_SCORE = 0.7
+
+EXPERIENCE_RANGE_PATTERN = re.compile(r'(\d+)\s*-\s*(\d+)')
+EXPERIENCE_OPEN_PATTERN = re.compile(r'(\d+)\s*\+')
+
+
+def parse_experience_requirement(required_experience):
+    """Parse strings like "2-4 years" or "5+ years" into (min, max) years"""
+    if not required_experience:
+        return None, None
+
+    match = EXPERIENCE_RANGE_PATTERN.search(required_experience)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+
+    match = EXPERIENCE_OPEN_PATTERN.search(required_experience)
+    if match:
+        return int(match.group(1)), None
+
+    return None, None
+
+
+def split_skills(skills):
+    """Normalize a GROUP_CONCAT string or an iterable into a list of skill names"""
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        return skills.split(',')
+    return list(skills)
+
+
+def score_thousandths(scores):
+    """Scores rounded to 3 decimals as integer thousandths, exactly like round(score, 3).
+
+    score * 1000 can land on the other side of .5 than the decimal value
+    does (0.6675 * 1000 is 667.4999...), so values near a half are settled
+    by round() itself.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    scaled = scores * 1000
+    thousandths = np.rint(scaled)
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(near_half)):
+        thousandths[index] = round(round(float(scores[index]), 3) * 1000)
+    return thousandths.astype(np.int64)
+
+
+def format_salary_range(career):
+    return f"${career['avg_salary_min']:,} - ${career['avg_salary_max']:,}"
+
+
+class CareerRecords:
+    """Read-only sequence of career dicts stored as one JSON document each.
+
+    Records live in a single byte array with offsets, so a memory-mapped
+    catalog snapshot costs nothing until a career is actually read.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @staticmethod
+    def encode(careers):
+        """Return (blob, offsets) arrays for a list of career dicts"""
+        documents = [json.dumps(career, separators=(',', ':')).encode('utf-8') for career in careers]
+        offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(document) for document in documents])
+        return np.frombuffer(b''.join(documents), dtype=np.uint8), offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return json.loads(self.blob[self.offsets[row]:self.offsets[row + 1]].tobytes())
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+
+class CareerFeatureStore:
+    """Pre-parsed numeric career features in compact column arrays.
+
+    Built once per catalog version so scoring never re-parses experience
+    strings or looks up education names. Row i describes careers[i].
+    Unparsed experience bounds are NaN; experience_required marks careers
+    that state any requirement at all.
+    """
+
+    COLUMNS = (
+        'career_ids', 'education_rank', 'min_experience', 'max_experience',
+        'experience_required', 'demand_score', 'growth_rate', 'skill_indptr', 'skill_ids'
+    )
+
+    def __init__(self, careers):
+        self.size = len(careers)
+        self.career_ids = np.array([career['id'] for career in careers], dtype=np.int64)
+
+        self.education_rank = np.array(
+            [EDUCATION_HIERARCHY.get(career.get('education_required'), 0) for career in careers],
+            dtype=np.int8
+        )
+
+        self.min_experience = np.full(self.size, np.nan, dtype=np.float32)
+        self.max_experience = np.full(self.size, np.nan, dtype=np.float32)
+        self.experience_required = np.zeros(self.size, dtype=bool)
+        for row, career in enumerate(careers):
+            required = career.get('experience_required')
+            if required:
+                self.experience_required[row] = True
+                min_exp, max_exp = parse_experience_requirement(required)
+                if min_exp is not None:
+                    self.min_experience[row] = min_exp
+                if max_exp is not None:
+                    self.max_experience[row] = max_exp
+
+        # Kept at full precision because it enters the weighted score directly
+        self.demand_score = np.array(
+            [career.get('demand_score') or 0.0 for career in careers],
+            dtype=np.float64
+        )
+        self.growth_rate = np.array(
+            [career.get('growth_rate') or 0.0 for career in careers],
+            dtype=np.float32
+        )
+
+        # Required skill ids per career in CSR layout:
+        # skill_ids[skill_indptr[i]:skill_indptr[i + 1]] belong to careers[i]
+        skill_id_lists = [career.get('required_skill_ids') or [] for career in careers]
+        self.skill_indptr = np.zeros(self.size + 1, dtype=np.int64)
+        self.skill_indptr[1:] = np.cumsum([len(ids) for ids in skill_id_lists])
+        self.skill_ids = np.array([skill_id for ids in skill_id_lists for skill_id in ids], dtype=np.int32)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Rebuild a store from the arrays returned by columns(), without copying them"""
+        store = cls.__new__(cls)
+        for name in cls.COLUMNS:
+            setattr(store, name, columns[name])
+        store.size = len(store.career_ids)
+        return store
+
+    def columns(self):
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    def career_skill_ids(self, row):
+        return self.skill_ids[self.skill_indptr[row]:self.skill_indptr[row + 1]]
+
+    def nbytes(self):
+        """Memory held by the feature columns"""
+        return sum(values.nbytes for values in self.columns().values())
+
+
+class CareerScoringEngine:
+    """Scores users against the whole career catalog in one matrix pass.
+
+    Careers are held as a binary career x skill CSR matrix plus the dense
+    columns of a CareerFeatureStore, so every component score is computed
+    with NumPy instead of per-career Python loops.
+    """
+
+    BATCH_CHUNK_SIZE = 256
+
+    # Arrays that fully describe an engine, as saved in catalog snapshots
+    ARRAYS = (
+        'skill_matrix_data', 'skill_matrix_indices', 'skill_matrix_indptr',
+        'skill_postings_data', 'skill_postings_indices', 'skill_postings_indptr',
+        'career_skill_counts', 'no_overlap_upper_bound', 'upper_bound_order',
+        'description_indptr', 'description_rows', 'career_blob', 'career_offsets'
+    )
+
+    def __init__(self, careers):
+        self.careers = [dict(career) for career in careers]
+        self.career_ids = np.array([career['id'] for career in self.careers], dtype=np.int64)
+        self.size = len(self.careers)
+
+        # Skill vocabulary and career x skill matrix
+        self.skill_index = {}
+        rows, cols = [], []
+        for row, career in enumerate(self.careers):
+            for name in set(split_skills(career.get('required_skills'))):
+                col = self.skill_index.setdefault(name, len(self.skill_index))
+                rows.append(row)
+                cols.append(col)
+        self.skill_names = list(self.skill_index)
+
+        self.skill_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(self.size, len(self.skill_index))
+        )
+        self.career_skill_counts = np.diff(self.skill_matrix.indptr).astype(np.float64)
+
+        # Pre-parsed feature columns
+        self.features = CareerFeatureStore(self.careers)
+        self.alias_features()
+
+        # Description word postings for interest matching
+        self.description_postings = {}
+        for row, career in enumerate(self.careers):
+            if career.get('description'):
+                for word in set(career['description'].lower().split()):
+                    self.description_postings.setdefault(word, []).append(row)
+
+        # Skill -> career posting lists: the careers requiring skill column j are
+        # skill_postings.indices[skill_postings.indptr[j]:skill_postings.indptr[j + 1]]
+        self.skill_postings = self.skill_matrix.tocsc()
+        self.skill_postings.sort_indices()
+
+        # Best overall score a career can reach without sharing a skill, and the
+        # careers in descending order of it for pruned top-k search
+        self.no_overlap_upper_bound = self.combine(
+            0.0, 1.0, 1.0, max(DEFAULT_INTEREST_SCORE, MATCHED_INTEREST_SCORE)
+        )
+        self.upper_bound_order = np.argsort(-self.no_overlap_upper_bound, kind='stable')
+
+    def alias_features(self):
+        self.education_rank = self.features.education_rank
+        self.min_experience = self.features.min_experience
+        self.experience_required = self.features.experience_required
+        self.demand_score = self.features.demand_score
+
+    def to_arrays(self):
+        """Return (arrays, metadata) that from_arrays() turns back into this engine.
+
+        Every per-career structure is a flat NumPy array; only the skill and
+        description vocabularies go into the JSON-serializable metadata.
+        """
+        words = list(self.description_postings)
+        postings = [np.asarray(self.description_postings[word], dtype=np.int64) for word in words]
+        description_indptr = np.zeros(len(words) + 1, dtype=np.int64)
+        description_indptr[1:] = np.cumsum([len(rows) for rows in postings])
+
+        if isinstance(self.careers, CareerRecords):
+            career_blob, career_offsets = self.careers.blob, self.careers.offsets
+        else:
+            # Required skills are already held by the skill matrix and features
+            career_blob, career_offsets = CareerRecords.encode([
+                {key: value for key, value in career.items()
+                 if key != 'required_skills' and key not in INTERNAL_CAREER_KEYS}
+                for career in self.careers
+            ])
+
+        arrays = {
+            'skill_matrix_data': self.skill_matrix.data,
+            'skill_matrix_indices': self.skill_matrix.indices,
+            'skill_matrix_indptr': self.skill_matrix.indptr,
+            'skill_postings_data': self.skill_postings.data,
+            'skill_postings_indices': self.skill_postings.indices,
+            'skill_postings_indptr': self.skill_postings.indptr,
+            'career_skill_counts': self.career_skill_counts,
+            'no_overlap_upper_bound': self.no_overlap_upper_bound,
+            'upper_bound_order': self.upper_bound_order,
+            'description_indptr': description_indptr,
+            'description_rows': np.concatenate(postings) if postings else np.zeros(0, dtype=np.int64),
+            'career_blob': career_blob,
+            'career_offsets': career_offsets
+        }
+        arrays.update({f'feature_{name}': values for name, values in self.features.columns().items()})
+        return arrays, {'skill_names': self.skill_names, 'description_words': words}
+
+    @classmethod
+    def from_arrays(cls, arrays, metadata):
+        """Rebuild an engine from to_arrays() output without copying the arrays.
+
+        Works on read-only memory-mapped arrays, so processes loading the
+        same snapshot share one copy of the catalog in the page cache.
+        """
+        engine = cls.__new__(cls)
+        engine.features = CareerFeatureStore.from_columns(
+            {name: arrays[f'feature_{name}'] for name in CareerFeatureStore.COLUMNS}
+        )
+        engine.alias_features()
+        engine.career_ids = engine.features.career_ids
+        engine.size = engine.features.size
+        engine.careers = CareerRecords(arrays['career_blob'], arrays['career_offsets'])
+
+        engine.skill_names = metadata['skill_names']
+        engine.skill_index = {name: col for col, name in enumerate(engine.skill_names)}
+        shape = (engine.size, len(engine.skill_names))
+        engine.skill_matrix = sparse.csr_matrix(
+            (arrays['skill_matrix_data'], arrays['skill_matrix_indices'], arrays['skill_matrix_indptr']),
+            shape=shape, copy=False
+        )
+        engine.skill_postings = sparse.csc_matrix(
+            (arrays['skill_postings_data'], arrays['skill_postings_indices'], arrays['skill_postings_indptr']),
+            shape=shape, copy=False
+        )
+        engine.career_skill_counts = arrays['career_skill_counts']
+        engine.no_overlap_upper_bound = arrays['no_overlap_upper_bound']
+        engine.upper_bound_order = arrays['upper_bound_order']
+
+        indptr, rows = arrays['description_indptr'], arrays['description_rows']
+        engine.description_postings = {
+            word: rows[indptr[position]:indptr[position + 1]]
+            for position, word in enumerate(metadata['description_words'])
+        }
+        return engine
+
+    def career_skills(self, row):
+        """Required skill names of one career"""
+        indptr = self.skill_matrix.indptr
+        return {self.skill_names[col] for col in self.skill_matrix.indices[indptr[row]:indptr[row + 1]]}
+
+    @property
+    def career_skill_names(self):
+        return [self.career_skills(row) for row in range(self.size)]
+
+    def user_skill_matrix(self, profiles):
+        """Build a users x skills sparse matrix and each user's distinct skill count"""
+        rows, cols, counts = [], [], []
+        for row, profile in enumerate(profiles):
+            names = set(split_skills(profile.get('skills')))
+            counts.append(len(names))
+            for name in names:
+                if name in self.skill_index:
+                    rows.append(row)
+                    cols.append(self.skill_index[name])
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(profiles), len(self.skill_index))
+        )
+        return matrix, np.array(counts, dtype=np.float64)
+
+    def select(self, values, columns):
+        """Restrict a per-career array to the given career rows"""
+        return values if columns is None else values[columns]
+
+    def skill_scores(self, intersections, user_skill_counts, columns=None):
+        """Jaccard similarity from users x careers intersection counts"""
+        career_counts = self.select(self.career_skill_counts, columns)[None, :]
+        user_counts = user_skill_counts[:, None]
+        union = career_counts + user_counts - intersections
+        scores = np.zeros_like(union)
+        valid = (union > 0) & (career_counts > 0) & (user_counts > 0)
+        np.divide(intersections, union, out=scores, where=valid)
+        return scores
+
+    def education_scores(self, education_levels, columns=None):
+        """Education compatibility for every user and career"""
+        user_levels = np.array([EDUCATION_HIERARCHY.get(level, 0) for level in education_levels])[:, None]
+        required = self.select(self.education_rank, columns)[None, :]
+        return np.where(
+            user_levels >= required, 1.0,
+            np.where(user_levels == required - 1, 0.8, 0.5)
+        )
+
+    def experience_scores(self, years_experience, columns=None):
+        """Experience compatibility for every user and career"""
+        user_experience = np.full(len(years_experience), np.nan)
+        for row, years in enumerate(years_experience):
+            try:
+                user_experience[row] = float(years or 0)
+            except (TypeError, ValueError):
+                pass
+
+        career_min_experience = self.select(self.min_experience, columns)
+        scores = np.full((len(years_experience), len(career_min_experience)), UNPARSED_EXPERIENCE_SCORE)
+        scores[:, ~self.select(self.experience_required, columns)] = 1.0
+
+        parsed = ~np.isnan(career_min_experience)
+        known = ~np.isnan(user_experience)
+        min_experience = career_min_experience[parsed][None, :]
+        users = user_experience[known][:, None]
+        scores[np.ix_(known, parsed)] = np.where(
+            users >= min_experience, 1.0,
+            np.where(users >= min_experience - 1, 0.8, 0.5)
+        )
+        return scores
+
+    def interest_scores(self, interests_list, columns=None):
+        """Interest match against career descriptions for every user"""
+        size = self.size if columns is None else len(columns)
+        if columns is not None:
+            # Map catalog rows to positions within the selected columns
+            positions = np.full(self.size, -1, dtype=np.int64)
+            positions[columns] = np.arange(size)
+
+        scores = np.full((len(interests_list), size), DEFAULT_INTEREST_SCORE)
+        for row, interests in enumerate(interests_list):
+            if interests:
+                matched = [col for word in interests for col in self.description_postings.get(word, ())]
+                if matched and columns is not None:
+                    matched = positions[matched]
+                    matched = matched[matched >= 0]
+                if len(matched):
+                    scores[row, matched] = MATCHED_INTEREST_SCORE
+        return scores
+
+    def combine(self, skill, education, experience, interest, columns=None):
+        """Weighted overall score"""
+        return (
+            skill * SCORE_WEIGHTS['skill'] +
+            education * SCORE_WEIGHTS['education'] +
+            experience * SCORE_WEIGHTS['experience'] +
+            interest * SCORE_WEIGHTS['interest'] +
+            self.select(self.demand_score, columns) * SCORE_WEIGHTS['demand']
+        )
+
+    def score_users(self, profiles, columns=None, intersections=None):
+        """Compute every component score and the overall score as users x careers arrays.
+
+        'match' is the overall score in thousandths as reported in
+        match_score; it is the ranking key, so order and display agree.
+        With columns (an array of catalog rows) only those careers are scored
+        and the arrays follow that order. Precomputed skill intersection
+        counts can be passed to skip the sparse product.
+        """
+        user_matrix, user_skill_counts = self.user_skill_matrix(profiles)
+        if intersections is None:
+            skill_matrix = self.skill_matrix if columns is None else self.skill_matrix[columns]
+            intersections = (user_matrix @ skill_matrix.T).toarray().astype(np.float64)
+
+        skill = self.skill_scores(intersections, user_skill_counts, columns)
+        education = self.education_scores([profile.get('education_level') for profile in profiles], columns)
+        experience = self.experience_scores([profile.get('years_experience') for profile in profiles], columns)
+        interest = self.interest_scores([profile.get('interests') for profile in profiles], columns)
+
+        overall = self.combine(skill, education, experience, interest, columns)
+        return {
+            'skill': skill,
+            'education': education,
+            'experience': experience,
+            'interest': interest,
+            'overall': overall,
+            'match': score_thousandths(overall)
+        }
+
+    def score_user(self, profile, columns=None, intersections=None):
+        """Compute every component score and the overall score for one user"""
+        return {name: values[0] for name, values in self.score_users([profile], columns, intersections).items()}
+
+    def top_k_indices(self, match, k, columns=None):
+        """Indices of the k best careers per row, ties broken by catalog order.
+
+        match holds the scores in thousandths from score_users(), so each
+        row is packed into unique integer keys and selected with
+        argpartition rather than a full sort. When match covers only some
+        careers, columns gives their catalog rows and the result indexes
+        positions within them.
+        """
+        size = match.shape[-1]
+        k = min(k, size)
+        if k <= 0:
+            return np.zeros(match.shape[:-1] + (0,), dtype=np.int64)
+
+        rows = np.arange(size) if columns is None else np.asarray(columns)
+        keys = match * self.size + (self.size - 1 - rows)
+        if k < size:
+            selected = np.argpartition(-keys, k - 1, axis=-1)[..., :k]
+        else:
+            selected = np.broadcast_to(np.arange(size), keys.shape).copy()
+
+        order = np.argsort(-np.take_along_axis(keys, selected, axis=-1), axis=-1)
+        return np.take_along_axis(selected, order, axis=-1)
+
+    def build_match(self, row, scores, user_skills, position=None):
+        """Build the recommendation dict for a single scored career.
+
+        position indexes the score arrays when they cover only some careers.
+        """
+        career = self.careers[row]
+        skill_gaps = list(self.career_skills(row) - user_skills)
+        position = row if position is None else position
+
+        return {
+            'career_id': career['id'],
+            'career_title': career['career_title'],
+            'industry': career['industry'],
+            'description': career['description'],
+            'match_score': int(scores['match'][position]) / 1000,
+            'skill_score': round(float(scores['skill'][position]), 3),
+            'education_score': round(float(scores['education'][position]), 3),
+            'experience_score': round(float(scores['experience'][position]), 3),
+            'interest_score': round(float(scores['interest'][position]), 3),
+            'skill_gaps': skill_gaps,
+            'salary_range': format_salary_range(career),
+            'growth_rate': career['growth_rate'],
+            'demand_score': career['demand_score']
+        }
+
+    def top_matches_batch(self, profiles, k=10):
+        """Score many users at once and return the top k matches for each.
+
+        Users are processed in chunks so the dense users x careers score
+        arrays stay bounded regardless of cohort size.
+        """
+        results = []
+        for start in range(0, len(profiles), self.BATCH_CHUNK_SIZE):
+            chunk = profiles[start:start + self.BATCH_CHUNK_SIZE]
+            scores = self.score_users(chunk)
+            top_indices = self.top_k_indices(scores['match'], k)
+
+            for row, profile in enumerate(chunk):
+                user_scores = {name: values[row] for name, values in scores.items()}
+                user_skills = set(split_skills(profile.get('skills')))
+                results.append([self.build_match(col, user_scores, user_skills)
+                                for col in top_indices[row]])
+        return results
+
+    def top_matches(self, profile, k=10):
+        """Score a user against every career and return the top k matches"""
+        return self.top_matches_batch([profile], k)[0]
+
+    def overlapping_careers(self, skills):
+        """Careers sharing at least one skill with the user, with intersection counts.
+
+        Merges the posting lists of the user's skills, so the cost depends on
+        the user's skills rather than the catalog size.
+        """
+        cols = [self.skill_index[name] for name in set(split_skills(skills)) if name in self.skill_index]
+        if not cols:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        indptr, indices = self.skill_postings.indptr, self.skill_postings.indices
+        postings = np.concatenate([indices[indptr[col]:indptr[col + 1]] for col in cols])
+        rows, counts = np.unique(postings, return_counts=True)
+        return rows.astype(np.int64), counts.astype(np.float64)
+
+    def top_matches_pruned(self, profile, k=10, block_size=256):
+        """Exact top k matches without scoring careers that cannot make the cut.
+
+        Careers sharing a skill are found via posting lists and scored
+        exactly. The rest have a skill score of 0, so they are visited in
+        descending order of their precomputed upper bound, a block at a time,
+        until that bound, rounded like match_score, falls below the current
+        k-th best score. Results equal top_matches().
+        """
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+
+        rows, counts = self.overlapping_careers(profile.get('skills'))
+        scored_rows = [rows]
+        scored = [self.score_user(profile, rows, counts[None, :])]
+
+        if len(rows) < self.size:
+            overlapping = np.zeros(self.size, dtype=bool)
+            overlapping[rows] = True
+            remaining = self.upper_bound_order[~overlapping[self.upper_bound_order]]
+
+            kth_key = None
+            if len(rows) >= k:
+                kth_key = np.sort(scored[0]['match'])[-k]
+
+            for start in range(0, len(remaining), block_size):
+                block = remaining[start:start + block_size]
+                # Rounding is monotonic, so no career in the block rounds above its rounded bound.
+                # Ties rank by catalog order, so stop only once the bound is strictly lower
+                if kth_key is not None and score_thousandths(self.no_overlap_upper_bound[block[:1]])[0] < kth_key:
+                    break
+                scored_rows.append(block)
+                scored.append(self.score_user(profile, block, np.zeros((1, len(block)))))
+
+                keys = np.concatenate([scores['match'] for scores in scored])
+                if len(keys) >= k:
+                    kth_key = np.partition(keys, len(keys) - k)[len(keys) - k]
+
+        columns = np.concatenate(scored_rows)
+        scores = {name: np.concatenate([part[name] for part in scored]) for name in scored[0]}
+        user_skills = set(split_skills(profile.get('skills')))
+        return [self.build_match(columns[position], scores, user_skills, position)
+                for position in self.top_k_indices(scores['match'], k, columns)]
+
+    def top_matches_among(self, profile, columns, k=10):
+        """Score a user against the given career rows only and return the top k matches"""
+        columns = np.asarray(columns, dtype=np.int64)
+        scores = self.score_user(profile, columns)
+        user_skills = set(split_skills(profile.get('skills')))
+        return [self.build_match(columns[position], scores, user_skills, position)
+                for position in self.top_k_indices(scores['match'], k, columns)]
@@ -0,0 +1,39 @@
+"""Fit and persist the career recommendation model.
+
+Fits the skill vectorizer, numeric scaler and KMeans career clusters over
+the current catalog and users, writes them to a new versioned artifact
+directory and points LATEST at it. The app loads LATEST at startup.
+
+Usage:
+    python -m models.train_model --clusters 8
+"""
+import argparse
+import time
+
+from database.models import init_db
+from models.ml_model import CareerRecommendationModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train and save the career recommendation model')
+    parser.add_argument('--clusters', type=int, default=8, help='number of KMeans career clusters')
+    parser.add_argument('--artifact-dir', default=None,
+                        help=f'output directory (default: {CareerRecommendationModel.ARTIFACT_DIR})')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    init_db()
+    model = CareerRecommendationModel()
+
+    started = time.perf_counter()
+    version = model.train(n_clusters=args.clusters, random_state=args.seed)
+    path = model.save_artifacts(args.artifact_dir)
+    print(f"Trained model {version} in {time.perf_counter() - started:.2f}s, saved to {path}")
+
+    started = time.perf_counter()
+    CareerRecommendationModel().load_artifacts(args.artifact_dir, version)
+    print(f"Artifact loads in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
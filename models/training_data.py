@@ -0,0 +1,210 @@
+"""Typed columnar store for the student career training dataset.
+
+data/Career Dataset.csv is read in chunks with explicit compact dtypes
+(int8/float32 numerics, categorical text columns) and converted once into
+one .npy file per column plus a schema.json with each column's dtype and
+categories. Later loads map the arrays instead of parsing the CSV or its
+.xlsx twin, and the store is rebuilt when the CSV changes.
+
+Convert and report load time and peak memory against plain read_csv:
+    python -m models.training_data --compare
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'Career Dataset.csv')
+STORE_DIR = os.environ.get(
+    'TRAINING_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts', 'training')
+)
+SCHEMA_FILE = 'schema.json'
+CHUNK_SIZE = 50000
+
+# Student_ID is an identifier only and is not stored
+NUMERIC_COLUMNS = {
+    'Age': 'int8',
+    'Year_of_Study': 'int8',
+    'CGPA': 'float32',
+    'Relevant_Coursework': 'int8',
+    'Prior_Employment': 'int8',
+    'Entrepreneurial_Experience': 'int8',
+    'Startup_Participation': 'int8',
+    'Career_Guidance_Satisfaction': 'int8',
+    'Entrepreneurship_Suitability_Score': 'int8',
+    'Predicted_Job_Success_Probability': 'int8',
+    'User_Satisfaction': 'int8',
+    'Followed_Recommendations': 'int8'
+}
+CATEGORICAL_COLUMNS = (
+    'Gender', 'Field_of_Study', 'University_Location', 'Employment_Type', 'Career_Interests',
+    'Entrepreneurial_Aspirations', 'Recommended_Career_Path', 'Top_Recommended_Industries',
+    'Employment_Status_Post_Graduation'
+)
+
+
+def source_signature(csv_path):
+    stat = os.stat(csv_path)
+    return {'path': os.path.abspath(csv_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def code_dtype(n_categories):
+    """Smallest signed integer type holding every code plus -1 for missing"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def write_column(part_path, part_dtype, npy_path, dtype, rows, chunk_size):
+    """Copy a raw column file into an .npy of the final dtype, chunk_size rows at a time"""
+    target = np.lib.format.open_memmap(npy_path, mode='w+', dtype=dtype, shape=(rows,))
+    if rows:
+        source = np.memmap(part_path, dtype=part_dtype, mode='r', shape=(rows,))
+        for start in range(0, rows, chunk_size):
+            target[start:start + chunk_size] = source[start:start + chunk_size]
+        del source
+    target.flush()
+    del target
+
+
+def convert_dataset(csv_path=DATASET_PATH, store_dir=STORE_DIR, chunk_size=CHUNK_SIZE):
+    """Convert the CSV into the column store and return its schema.
+
+    Chunks are appended to raw per-column files, so memory stays bounded
+    by chunk_size whatever the file size. Category codes are assigned as
+    values first appear and narrowed to the smallest integer type at the end.
+    """
+    staging = f'{store_dir}.tmp{os.getpid()}'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    categories = {name: {} for name in CATEGORICAL_COLUMNS}
+    parts = {name: open(os.path.join(staging, f'{name}.part'), 'wb')
+             for name in list(NUMERIC_COLUMNS) + list(CATEGORICAL_COLUMNS)}
+    rows = 0
+    order = list(NUMERIC_COLUMNS) + list(CATEGORICAL_COLUMNS)
+    try:
+        chunks = pd.read_csv(
+            csv_path, chunksize=chunk_size,
+            usecols=list(NUMERIC_COLUMNS) + list(CATEGORICAL_COLUMNS),
+            dtype={**NUMERIC_COLUMNS, **{name: 'category' for name in CATEGORICAL_COLUMNS}}
+        )
+        for chunk in chunks:
+            # Keep the file's column order
+            order = list(chunk.columns)
+            rows += len(chunk)
+            for name in NUMERIC_COLUMNS:
+                chunk[name].to_numpy().tofile(parts[name])
+            for name in CATEGORICAL_COLUMNS:
+                # Chunk-local codes -> dataset-wide codes; -1 (missing) stays -1
+                values = chunk[name].cat
+                seen = categories[name]
+                remap = np.array([seen.setdefault(value, len(seen)) for value in values.categories] + [-1],
+                                 dtype=np.int64)
+                remap[values.codes.to_numpy()].tofile(parts[name])
+    finally:
+        for part in parts.values():
+            part.close()
+
+    columns = {}
+    for name in order:
+        part_path = os.path.join(staging, f'{name}.part')
+        if name in NUMERIC_COLUMNS:
+            dtype = np.dtype(NUMERIC_COLUMNS[name])
+            columns[name] = {'dtype': dtype.name}
+            source_dtype = dtype
+        else:
+            dtype = np.dtype(code_dtype(len(categories[name])))
+            columns[name] = {'dtype': dtype.name, 'categories': list(categories[name])}
+            source_dtype = np.dtype(np.int64)
+        write_column(part_path, source_dtype, os.path.join(staging, f'{name}.npy'), dtype, rows, chunk_size)
+        os.remove(part_path)
+
+    schema = {'rows': rows, 'source': source_signature(csv_path), 'columns': columns}
+    with open(os.path.join(staging, SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(staging, store_dir)
+    return schema
+
+
+def read_schema(store_dir=STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, SCHEMA_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_dataset(store_dir=STORE_DIR):
+    """Load the column store as a DataFrame with categorical text columns"""
+    schema = read_schema(store_dir)
+    if schema is None:
+        raise FileNotFoundError(f'No training dataset store in {store_dir}')
+
+    data = {}
+    for name, column in schema['columns'].items():
+        values = np.load(os.path.join(store_dir, f'{name}.npy'), mmap_mode='r')
+        if 'categories' in column:
+            data[name] = pd.Categorical.from_codes(values, categories=column['categories'])
+        else:
+            data[name] = np.asarray(values)
+    return pd.DataFrame(data)
+
+
+def load_training_dataset(csv_path=DATASET_PATH, store_dir=STORE_DIR):
+    """Load the training dataset, converting the CSV first if it is new or changed"""
+    schema = read_schema(store_dir)
+    if schema is None or schema['source'] != source_signature(csv_path):
+        convert_dataset(csv_path, store_dir)
+    return load_dataset(store_dir)
+
+
+def measure(load):
+    """Run load() and return (result, seconds, peak traced MB)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = load()
+        return result, time.perf_counter() - started, tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the career training dataset into a typed column store')
+    parser.add_argument('--csv', default=DATASET_PATH)
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--compare', action='store_true', help='also time read_csv and the .xlsx with openpyxl')
+    args = parser.parse_args()
+
+    schema, seconds, peak = measure(lambda: convert_dataset(args.csv, args.store_dir, args.chunk_size))
+    print(f"Converted {schema['rows']} rows in {seconds * 1000:.1f} ms (peak {peak:.2f} MB)")
+
+    df, seconds, peak = measure(lambda: load_dataset(args.store_dir))
+    print(f"Column store: {seconds * 1000:.1f} ms, peak {peak:.2f} MB, "
+          f"{df.memory_usage(deep=True).sum() / 1024:.0f} KiB in memory")
+
+    if args.compare:
+        df, seconds, peak = measure(lambda: pd.read_csv(args.csv))
+        print(f"read_csv: {seconds * 1000:.1f} ms, peak {peak:.2f} MB, "
+              f"{df.memory_usage(deep=True).sum() / 1024:.0f} KiB in memory")
+        xlsx = os.path.splitext(args.csv)[0] + '.xlsx'
+        if os.path.exists(xlsx):
+            try:
+                df, seconds, peak = measure(lambda: pd.read_excel(xlsx))
+                print(f"read_excel: {seconds * 1000:.1f} ms, peak {peak:.2f} MB")
+            except ImportError as e:
+                print(f"Error reading {xlsx}: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -140,7 +140,7 @@ class CareerApp {
                     body: formData
                 });
 
-                const result = await response.json();
+                const result = await waitForResumeJob(await response.json());
                 this.hideLoading();
                 uploadStatus.classList.add('hidden');
 
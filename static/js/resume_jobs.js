@@ -0,0 +1,18 @@
+// Poll a background resume processing job until it finishes or maxPolls runs out
+async function waitForResumeJob(result, intervalMs = 1000, maxPolls = 120) {
+    if (!result.success || !result.status_url) {
+        return result;
+    }
+    for (let poll = 0; poll < maxPolls; poll++) {
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+        const response = await fetch(result.status_url);
+        const job = await response.json();
+        if (job.status === 'completed') {
+            return { success: true, skills: job.result.skills };
+        }
+        if (job.status === 'failed' || !job.success) {
+            return { success: false, error: job.error || 'Resume processing failed' };
+        }
+    }
+    return { success: false, error: 'Resume processing timed out, please try again' };
+}
@@ -140,7 +140,7 @@ class CareerApp {
                     body: formData
                 });
 
-                const result = await response.json();
+                const result = await waitForResumeJob(await response.json());
                 this.hideLoading();
                 uploadStatus.classList.add('hidden');
 
@@ -463,7 +463,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     method: 'POST',
                     body: formData
                 });
-                const result = await response.json();
+                const result = await waitForResumeJob(await response.json());
                 statusDiv.classList.add('hidden');
                 if (result.success) {
                     // Show extracted skills
@@ -0,0 +1,35 @@
+import pytest
+
+import database.models as db
+from benchmarks.synthetic_db import build_database
+from models.ml_model import CareerRecommendationModel
+
+
+def reset_caches():
+    db.career_catalog.invalidate()
+    db.release_thread_connection()
+    db.get_pool().close_all()
+
+
+@pytest.fixture(scope='session')
+def synthetic_db(tmp_path_factory):
+    """A 2000 career, 600 user synthetic database set as DATABASE_NAME"""
+    path = str(tmp_path_factory.mktemp('db') / 'synthetic.db')
+    build_database(path, careers=2000, users=600, skills=500)
+    previous = db.DATABASE_NAME
+    reset_caches()
+    db.DATABASE_NAME = path
+    yield path
+    reset_caches()
+    db.DATABASE_NAME = previous
+
+
+@pytest.fixture
+def model(synthetic_db):
+    return CareerRecommendationModel()
+
+
+@pytest.fixture
+def user_ids(synthetic_db):
+    with db.db_connection() as conn:
+        return [row[0] for row in conn.execute('SELECT id FROM users ORDER BY id')]
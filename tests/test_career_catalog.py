@@ -0,0 +1,16 @@
+import database.models as db
+from models.recommendation_engine import RecommendationEngine
+from models.scoring_engine import CareerScoringEngine
+
+
+def test_internal_keys_stay_in_the_catalog(synthetic_db):
+    careers = db.career_catalog.careers()
+    assert 'required_skill_ids' in careers[0]
+
+    career_ids = [career['id'] for career in careers[:3]]
+    for career in RecommendationEngine().compare_careers(career_ids):
+        assert not set(db.INTERNAL_CAREER_KEYS) & set(career)
+
+    arrays, metadata = CareerScoringEngine(careers).to_arrays()
+    engine = CareerScoringEngine.from_arrays(arrays, metadata)
+    assert not set(db.INTERNAL_CAREER_KEYS) & set(engine.careers[0])
@@ -0,0 +1,40 @@
+import threading
+
+from database.models import ConnectionPool
+
+
+def test_double_close_pools_connection_once(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'))
+    conn = pool.acquire()
+    conn.close()
+    conn.close()
+    assert conn.depth == 0
+    assert pool.stats()['idle'] == 1
+
+    # Two threads holding connections at once must get different ones
+    held = []
+    ready = threading.Barrier(2)
+
+    def hold():
+        held.append(pool.acquire())
+        ready.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert held[0] is not held[1]
+    pool.close_all()
+
+
+def test_nested_holds_share_one_connection(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'))
+    outer = pool.acquire()
+    inner = pool.acquire()
+    assert inner is outer
+    inner.close()
+    assert pool.stats()['idle'] == 0
+    outer.close()
+    assert pool.stats()['idle'] == 1
+    pool.close_all()
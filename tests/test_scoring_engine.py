@@ -0,0 +1,68 @@
+import numpy as np
+
+import database.models as db
+from models.cluster_gate import ClusterGate
+from models.scoring_engine import score_thousandths
+
+
+def assert_ranked(matches):
+    scores = [match['match_score'] for match in matches]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_score_thousandths_matches_round():
+    rng = np.random.default_rng(0)
+    # Half-thousandth values are where x * 1000 and round(x, 3) disagree
+    values = np.concatenate([rng.random(20000), (np.arange(2000) + 0.5) / 1000])
+    expected = [round(round(float(value), 3) * 1000) for value in values]
+    assert score_thousandths(values).tolist() == expected
+
+
+def test_full_scoring_ranks_by_match_score(model, user_ids):
+    model.CANDIDATE_COUNT = 10 ** 6
+    for user_id in user_ids:
+        assert_ranked(model.predict_career_match(user_id))
+
+
+
+def test_pruned_matches_full_scoring(model, user_ids):
+    engine = model.get_scoring_engine()
+    profiles = model.load_user_profiles(user_ids)
+    assert engine.size > model.CANDIDATE_COUNT
+    for user_id in user_ids:
+        pruned = model.predict_career_match(user_id)
+        assert_ranked(pruned)
+        assert pruned == engine.top_matches(profiles[user_id])
+
+
+def test_batch_matches_single_user(model, user_ids):
+    engine = model.get_scoring_engine()
+    profiles = model.load_user_profiles(user_ids)
+    for user_id, matches in model.predict_career_matches(user_ids).items():
+        assert_ranked(matches)
+        assert matches == engine.top_matches(profiles[user_id])
+
+
+def test_cluster_gate_falls_back_below_min_recall(model, user_ids):
+    model.train()
+    model.scoring_mode = 'clusters'
+    gate = model.get_cluster_gate()
+    assert gate.recall is not None and gate.recall < gate.min_recall
+    assert not gate.enabled
+
+    engine = model.get_scoring_engine()
+    profiles = model.load_user_profiles(user_ids[:50])
+    for user_id, profile in profiles.items():
+        assert model.predict_career_match(user_id) == engine.top_matches(profile)
+    assert gate.metrics()['fallbacks'] == len(profiles)
+
+    permissive = ClusterGate(engine, model, min_recall=0.0)
+    assert permissive.calibrate(profiles.values()) is not None
+    assert permissive.enabled
+
+
+def test_unknown_user_releases_connection(model):
+    assert model.predict_career_match(-1) == []
+    conn = db.get_db_connection()
+    assert conn.depth == 1
+    conn.close()
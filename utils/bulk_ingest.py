@@ -0,0 +1,238 @@
+"""Bulk re-extraction of skills from every stored resume.
+
+Fans files out to a process pool, streams results back as they finish,
+and writes skills, user_skills and a per-run checkpoint log in large
+executemany transactions. Files already logged as completed for a run
+are skipped, so an interrupted run resumes where it stopped. Files with
+no resume_files owner (legacy uploads) are logged as 'skipped', since no
+skills were written for them, and are retried by later runs.
+
+Usage:
+    python -m utils.bulk_ingest --run-name skills-v2 --workers 4
+"""
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+from database.models import init_db, get_db_connection
+from utils.resume_cache import ResumeCache
+from utils.resume_parser import ResumeParser
+from utils.skill_extractor import SkillExtractor
+
+UPLOAD_FOLDER = 'static/uploads'
+ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+
+_parser = None
+_extractor = None
+
+
+def _init_worker():
+    """Build the parser and extractor once per worker process"""
+    global _parser, _extractor
+    _parser = ResumeParser(cache=ResumeCache())
+    _extractor = SkillExtractor()
+
+
+def process_file(file_path):
+    """Parse one resume and extract its skills (runs in a worker process)"""
+    started = time.perf_counter()
+    try:
+        parsed = _parser.parse_resume(file_path)
+        if 'error' in parsed:
+            raise ValueError(parsed['error'])
+        skills = _extractor.extract_skills(parsed['text'])
+        return {
+            'file_path': file_path,
+            'page_count': parsed.get('page_count', 1),
+            'skills': skills,
+            'error': None,
+            'seconds': time.perf_counter() - started
+        }
+    except Exception as e:
+        return {
+            'file_path': file_path,
+            'page_count': 0,
+            'skills': {},
+            'error': str(e),
+            'seconds': time.perf_counter() - started
+        }
+
+
+def list_resume_files(upload_folder):
+    """All resumes in the upload folder with a supported extension"""
+    files = []
+    for name in sorted(os.listdir(upload_folder)):
+        if '.' in name and name.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS:
+            files.append(os.path.join(upload_folder, name))
+    return files
+
+
+class BulkIngestor:
+    """Writes extraction results in batched transactions with a checkpoint log"""
+
+    def __init__(self, conn, run_name):
+        self.conn = conn
+        self.run_name = run_name
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT id, skill_name FROM skills')
+        self.skill_ids = {row['skill_name']: row['id'] for row in cursor.fetchall()}
+
+        # Resume owners keyed by file name, since upload names are unique;
+        # deduplicated uploads can be shared by several users
+        cursor.execute('SELECT user_id, file_path FROM resume_files')
+        self.owners = {}
+        for row in cursor.fetchall():
+            self.owners.setdefault(os.path.basename(row['file_path']), []).append(row['user_id'])
+
+    def completed_files(self):
+        """Files already processed successfully in this run; failures are retried"""
+        cursor = self.conn.execute(
+            "SELECT file_path FROM resume_ingestion_log WHERE run_name = ? AND status = 'completed'",
+            (self.run_name,)
+        )
+        return {row['file_path'] for row in cursor.fetchall()}
+
+    def reset(self):
+        """Forget this run's checkpoint so every file is processed again"""
+        with self.conn:
+            self.conn.execute('DELETE FROM resume_ingestion_log WHERE run_name = ?', (self.run_name,))
+
+    def write_batch(self, results):
+        """Persist a batch of results and their checkpoint rows in one transaction.
+
+        Returns (user skill rows written, files skipped for having no owner).
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+
+            new_skills = sorted({
+                skill_name for result in results for skill_name in result['skills']
+                if skill_name not in self.skill_ids
+            })
+            if new_skills:
+                cursor.executemany(
+                    'INSERT OR IGNORE INTO skills (skill_name, category, importance_score) VALUES (?, ?, ?)',
+                    [(skill_name, 'Technical', 0.7) for skill_name in new_skills]
+                )
+                for start in range(0, len(new_skills), 500):
+                    chunk = new_skills[start:start + 500]
+                    cursor.execute(
+                        f"SELECT id, skill_name FROM skills WHERE skill_name IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    for row in cursor.fetchall():
+                        self.skill_ids[row['skill_name']] = row['id']
+
+            user_skill_rows = []
+            for result in results:
+                for user_id in self.owners.get(os.path.basename(result['file_path']), []):
+                    for skill_name, confidence in result['skills'].items():
+                        proficiency_level = min(5, max(1, int(confidence * 5)))
+                        user_skill_rows.append((user_id, self.skill_ids[skill_name], proficiency_level, 'Resume'))
+
+            cursor.executemany('''
+                INSERT OR REPLACE INTO user_skills (user_id, skill_id, proficiency_level, source)
+                VALUES (?, ?, ?, ?)
+            ''', user_skill_rows)
+
+            cursor.executemany('''
+                INSERT OR REPLACE INTO resume_ingestion_log
+                (run_name, file_path, status, page_count, skill_count, error, processed_at)
+                VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+            ''', [(self.run_name, result['file_path'], self.status(result),
+                   result['page_count'], len(result['skills']), result['error'])
+                  for result in results])
+
+        return len(user_skill_rows), sum(1 for result in results if self.status(result) == 'skipped')
+
+    def status(self, result):
+        """Checkpoint status of a result; only 'completed' files are not retried"""
+        if result['error']:
+            return 'failed'
+        if not self.owners.get(os.path.basename(result['file_path'])):
+            return 'skipped'
+        return 'completed'
+
+
+def ingest(upload_folder=UPLOAD_FOLDER, run_name='default', workers=None,
+           batch_size=200, chunksize=4, restart=False, verbose=True):
+    """Re-extract skills from every stored resume and return throughput stats"""
+    init_db()
+    conn = get_db_connection()
+    ingestor = BulkIngestor(conn, run_name)
+
+    if restart:
+        ingestor.reset()
+
+    done = ingestor.completed_files()
+    pending = [path for path in list_resume_files(upload_folder) if path not in done]
+
+    stats = {
+        'run_name': run_name,
+        'skipped': len(done),
+        'files': 0,
+        'failed': 0,
+        'unowned': 0,
+        'pages': 0,
+        'user_skill_rows': 0,
+        'seconds': 0.0
+    }
+
+    started = time.perf_counter()
+    batch = []
+
+    def flush():
+        rows, unowned = ingestor.write_batch(batch)
+        stats['user_skill_rows'] += rows
+        stats['unowned'] += unowned
+        stats['files'] += len(batch)
+        stats['failed'] += sum(1 for result in batch if result['error'])
+        stats['pages'] += sum(result['page_count'] for result in batch)
+        batch.clear()
+        if verbose:
+            elapsed = time.perf_counter() - started
+            print(f"{stats['files']}/{len(pending)} files, "
+                  f"{stats['files'] / elapsed:.1f} files/sec, {stats['pages'] / elapsed:.1f} pages/sec")
+
+    try:
+        if pending:
+            with Pool(processes=workers, initializer=_init_worker) as pool:
+                for result in pool.imap_unordered(process_file, pending, chunksize=chunksize):
+                    batch.append(result)
+                    if len(batch) >= batch_size:
+                        flush()
+            if batch:
+                flush()
+    finally:
+        conn.close()
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['files_per_sec'] = stats['files'] / stats['seconds'] if stats['seconds'] else 0.0
+    stats['pages_per_sec'] = stats['pages'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract skills from every stored resume')
+    parser.add_argument('--upload-folder', default=UPLOAD_FOLDER)
+    parser.add_argument('--run-name', default='default',
+                        help='checkpoint name; reuse it to resume an interrupted run')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=200, help='files per write transaction')
+    parser.add_argument('--chunksize', type=int, default=4, help='files handed to a worker at a time')
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint and process every file')
+    args = parser.parse_args()
+
+    stats = ingest(args.upload_folder, args.run_name, args.workers,
+                   args.batch_size, args.chunksize, args.restart)
+
+    print(f"Processed {stats['files']} files ({stats['failed']} failed, {stats['unowned']} skipped without an owner, "
+          f"{stats['skipped']} already done) "
+          f"in {stats['seconds']:.2f}s: {stats['files_per_sec']:.1f} files/sec, "
+          f"{stats['pages_per_sec']:.1f} pages/sec, {stats['user_skill_rows']} user skills written")
+
+
+if __name__ == '__main__':
+    main()
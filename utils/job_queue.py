@@ -0,0 +1,130 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from database.models import release_thread_connection
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A unit of background work with its status, progress and result"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    def __init__(self, owner=None):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.status = self.QUEUED
+        self.stage = 'queued'
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.updated_at = self.created_at
+        self._lock = threading.Lock()
+
+    def update(self, stage=None, progress=None):
+        """Report progress from inside the job function"""
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+            if progress is not None:
+                self.progress = max(0.0, min(float(progress), 1.0))
+            self.updated_at = datetime.now()
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.status = status
+            self.stage = status
+            self.result = result
+            self.error = error
+            if status == self.COMPLETED:
+                self.progress = 1.0
+            self.updated_at = datetime.now()
+
+    @property
+    def finished(self):
+        return self.status in (self.COMPLETED, self.FAILED)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'stage': self.stage,
+                'progress': round(self.progress, 2),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at.isoformat(),
+                'updated_at': self.updated_at.isoformat()
+            }
+
+
+class JobQueue:
+    """In-process job queue backed by a thread pool.
+
+    Needs no external broker: jobs are submitted from request handlers,
+    run on a fixed number of worker threads, and tracked in memory so a
+    status endpoint can report progress. Only the most recent finished
+    jobs are retained.
+    """
+
+    def __init__(self, max_workers=2, max_finished_jobs=1000):
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, owner=None, **kwargs):
+        """Queue func(job, *args, **kwargs) and return the Job immediately"""
+        job = Job(owner=owner)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        """Return a job by id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """Count of tracked jobs by status"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {Job.QUEUED: 0, Job.RUNNING: 0, Job.COMPLETED: 0, Job.FAILED: 0}
+        for job in jobs:
+            counts[job.status] += 1
+        return counts
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job, func, args, kwargs):
+        with job._lock:
+            job.status = Job.RUNNING
+            job.stage = 'started'
+            job.updated_at = datetime.now()
+        try:
+            result = func(job, *args, **kwargs)
+            job._finish(Job.COMPLETED, result=result)
+        except Exception as e:
+            logger.exception("Error running job %s", job.id)
+            job._finish(Job.FAILED, error=str(e))
+        finally:
+            # Roll back and return any connection the job left held on this worker thread
+            release_thread_connection()
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the retention limit"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """In-process LRU cache with a TTL for per-user response data.
+
+    Entries are keyed by (namespace, user_id, data_version), so a new data
+    version simply misses and the stale entry ages out. Writers should still
+    call invalidate_user() to drop a user's entries straight away. Cached
+    values are shared between requests and must not be modified.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._user_keys = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, namespace, user_id, version):
+        """Return the cached value, or None on a miss"""
+        key = (namespace, user_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, namespace, user_id, version, value):
+        key = (namespace, user_id, version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, namespace, user_id, version, compute):
+        """Return the cached value, computing and storing it on a miss"""
+        value = self.get(namespace, user_id, version)
+        if value is None:
+            value = compute()
+            self.put(namespace, user_id, version, value)
+        return value
+
+    def invalidate_user(self, user_id):
+        """Drop every cached entry for a user"""
+        with self._lock:
+            keys = self._user_keys.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        keys = self._user_keys.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[key[1]]
@@ -0,0 +1,175 @@
+"""Content-addressed cache for parsed resumes and extracted skills.
+
+Entries are keyed by the SHA-256 of the file contents plus the stage and
+the parser/extractor version that produced them, so re-uploading the same
+file skips PDF text extraction and skill matching. Component VERSIONs
+hash the keyword lists, patterns and skill data they depend on, so editing
+them invalidates stale results without a manual bump.
+
+Usage (find duplicate uploads, add --apply to remove them):
+    python -m utils.resume_cache --dedupe
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+
+from database.models import get_db_connection
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_version(*parts):
+    """Short hash of the lists, dicts and compiled patterns a component's output depends on"""
+    def encode(value):
+        if isinstance(value, re.Pattern):
+            return [value.pattern, value.flags]
+        raise TypeError(f'Cannot hash {type(value).__name__}')
+
+    payload = json.dumps(parts, sort_keys=True, default=encode)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def component_version(component):
+    """Version tag of a parser or extractor instance"""
+    return f"{type(component).__name__}-{getattr(component, 'VERSION', '0')}"
+
+
+class ResumeCache:
+    """SQLite-backed cache of resume processing results"""
+
+    PARSE = 'parse'
+    SKILLS = 'skills'
+
+    def get(self, content_hash, stage, version):
+        """Return the cached payload, or None"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                SELECT payload FROM resume_cache
+                WHERE content_hash = ? AND stage = ? AND version = ?
+            ''', (content_hash, stage, version)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row['payload']) if row else None
+
+    def put(self, content_hash, stage, version, payload):
+        """Store a payload; failures only cost a future cache miss"""
+        try:
+            conn = get_db_connection()
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO resume_cache (content_hash, stage, version, payload)
+                    VALUES (?, ?, ?, ?)
+                ''', (content_hash, stage, version, json.dumps(payload, separators=(',', ':'))))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error writing resume cache: {e}")
+
+    def parse_resume(self, parser, file_path, content_hash=None):
+        """Parse a resume, reusing the cached parse of identical files"""
+        content_hash = content_hash or hash_file(file_path)
+        version = component_version(parser)
+        parsed_data = self.get(content_hash, self.PARSE, version)
+        if parsed_data is None:
+            parsed_data = parser.parse_resume_uncached(file_path)
+            if 'error' not in parsed_data:
+                self.put(content_hash, self.PARSE, version, parsed_data)
+        return parsed_data
+
+    def extract_skills(self, parser, extractor, file_path, content_hash=None):
+        """Parse a resume and extract its skills, reusing cached results for identical files.
+
+        A skills miss (e.g. after an extractor change) still reuses the cached
+        parse, so the file's text is not extracted again.
+        """
+        content_hash = content_hash or hash_file(file_path)
+        version = f"{component_version(parser)}:{component_version(extractor)}"
+
+        skills = self.get(content_hash, self.SKILLS, version)
+        if skills is not None:
+            return skills
+
+        resume_data = self.parse_resume(parser, file_path, content_hash)
+        if 'error' in resume_data:
+            raise ValueError(resume_data['error'])
+
+        skills = extractor.extract_skills(resume_data['text'])
+        self.put(content_hash, self.SKILLS, version, skills)
+        return skills
+
+
+def find_duplicate_uploads(upload_folder):
+    """Group upload files by content hash, keeping groups with more than one file"""
+    groups = {}
+    for name in sorted(os.listdir(upload_folder)):
+        path = os.path.join(upload_folder, name)
+        if os.path.isfile(path):
+            groups.setdefault(hash_file(path), []).append(path)
+    return {content_hash: paths for content_hash, paths in groups.items() if len(paths) > 1}
+
+
+def deduplicate_uploads(upload_folder, apply=False):
+    """Point every owner of a duplicate upload at the first copy and remove the rest"""
+    duplicates = find_duplicate_uploads(upload_folder)
+    removed = []
+
+    conn = get_db_connection()
+    try:
+        for content_hash, paths in duplicates.items():
+            keep, extra = paths[0], paths[1:]
+            if not apply:
+                removed.extend(extra)
+                continue
+            with conn:
+                conn.execute('UPDATE resume_files SET content_hash = ? WHERE file_path = ?',
+                             (content_hash, keep))
+                for path in extra:
+                    conn.execute('''
+                        UPDATE OR IGNORE resume_files SET file_path = ?, content_hash = ?
+                        WHERE file_path = ?
+                    ''', (keep, content_hash, path))
+                    conn.execute('DELETE FROM resume_files WHERE file_path = ?', (path,))
+            for path in extra:
+                os.remove(path)
+                removed.append(path)
+    finally:
+        conn.close()
+
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resume cache maintenance')
+    parser.add_argument('--dedupe', action='store_true', help='find duplicate uploads by content hash')
+    parser.add_argument('--apply', action='store_true', help='remove duplicates instead of listing them')
+    parser.add_argument('--upload-folder', default='static/uploads')
+    args = parser.parse_args()
+
+    if args.dedupe:
+        removed = deduplicate_uploads(args.upload_folder, apply=args.apply)
+        action = 'Removed' if args.apply else 'Would remove'
+        for path in removed:
+            print(f"{action} {path}")
+        print(f"{action} {len(removed)} duplicate files")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,36 +3,185 @@ import docx
 import re
 from datetime import datetime
 import os
+from utils.resume_cache import data_version
+
+# Patterns compiled once and shared by every parser instance
+PATTERNS = {
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    'phone': re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    'linkedin': re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE),
+    'name_excluded_chars': re.compile(r'[0-9@]'),
+    'degrees': [
+        re.compile(r'(Bachelor|Master|PhD|Ph\.D|MBA|B\.S|M\.S|B\.A|M\.A)\s+.*?(\d{4})', re.IGNORECASE),
+        re.compile(r'(Diploma|Certificate)\s+.*?(\d{4})', re.IGNORECASE),
+        re.compile(r'(University|College)\s+.*?(\d{4})', re.IGNORECASE)
+    ],
+    'jobs': [
+        re.compile(r'([A-Z][a-z\s]+(?:Manager|Developer|Engineer|Analyst|Specialist|Coordinator|Director|Lead|Senior|Junior))\s*[-–]\s*([A-Z][A-Za-z\s&.,]+)?\s*\(?([\d]{4})\s*[-–]\s*([\d]{4}|Present)', re.IGNORECASE | re.MULTILINE),
+        re.compile(r'([A-Z][a-z\s]+(?:Manager|Developer|Engineer|Analyst|Specialist|Coordinator|Director|Lead|Senior|Junior))\s+at\s+([A-Z][A-Za-z\s&.,]+)\s*\(?([\d]{4})', re.IGNORECASE | re.MULTILINE)
+    ],
+    'skills': [
+        re.compile(r'([A-Z][a-zA-Z+#\s]+(?:Python|Java|JavaScript|React|Angular|Vue|Node|SQL|HTML|CSS|AWS|Docker|Git|Linux|Windows|MacOS|Office|Excel|PowerPoint|Photoshop|Illustrator))'),
+        re.compile(r'•\s*([A-Za-z+#\s]+)'),
+        re.compile(r'-\s*([A-Za-z+#\s]+)'),
+        re.compile(r'\n([A-Z][a-zA-Z+#\s]{2,20})(?:\n|$)')
+    ],
+    'certifications': [
+        re.compile(r'([A-Z][A-Za-z\s]+(?:Certification|Certificate|Course))\s*[-–]\s*([A-Za-z\s]+)?\s*\(?([\d]{4})', re.IGNORECASE),
+        re.compile(r'([A-Z][A-Za-z\s]+)\s+Certified\s*\(?([\d]{4})', re.IGNORECASE),
+        re.compile(r'([A-Z][A-Za-z\s]+)\s+Certificate\s*\(?([\d]{4})', re.IGNORECASE)
+    ]
+}
+
+EDUCATION_KEYWORDS = [
+    'education', 'degree', 'university', 'college', 'bachelor', 'master', 
+    'phd', 'diploma', 'certification', 'course', 'school'
+]
+
+EXPERIENCE_KEYWORDS = [
+    'experience', 'work', 'employment', 'job', 'position', 'role',
+    'worked', 'served', 'employed', 'career', 'professional'
+]
+
+SKILL_KEYWORDS = [
+    'skills', 'technical skills', 'programming', 'languages', 
+    'technologies', 'tools', 'software', 'frameworks', 'libraries'
+]
+
+CERTIFICATION_KEYWORDS = ['certification', 'certificate', 'course', 'training', 'certified']
+
+SUMMARY_KEYWORDS = ['summary', 'objective', 'profile', 'about', 'overview']
+
+# Headings that end the current section
+SECTION_HEADING_KEYWORDS = [
+    'education', 'experience', 'skills', 'projects', 'certifications',
+    'achievements', 'awards', 'references', 'contact', 'summary'
+]
+
+# Keywords whose presence ends a summary block
+SUMMARY_STOP_KEYWORDS = ['education', 'experience', 'skills']
+
+SECTION_KEYWORDS = {
+    'education': EDUCATION_KEYWORDS,
+    'experience': EXPERIENCE_KEYWORDS,
+    'skills': SKILL_KEYWORDS,
+    'certifications': CERTIFICATION_KEYWORDS
+}
+
+
+def line_matches(line, keywords):
+    return any(keyword in line for keyword in keywords)
+
+
+class ResumeDocument:
+    """Resume text split into lines once, with section boundaries indexed.
+
+    A single scan over the lowercased lines records where every known
+    section starts and ends, so each extractor slices the shared line list
+    instead of re-splitting and re-searching the full text.
+    """
+    
+    def __init__(self, text, sections=SECTION_KEYWORDS):
+        self.text = text
+        self.lines = text.split('\n')
+        self.lower_lines = [line.lower() for line in self.lines]
+        self.sections = sections
+        self._section_text = {}
+        
+        starts = {name: -1 for name in sections}
+        ends = {name: len(self.lines) for name in sections}
+        open_sections = set()
+        summary_start = -1
+        
+        for i, line in enumerate(self.lower_lines):
+            is_heading = line_matches(line, SECTION_HEADING_KEYWORDS)
+            
+            for name in list(open_sections):
+                if i >= starts[name] + 2 and is_heading and not line_matches(line, sections[name]):
+                    ends[name] = i
+                    open_sections.discard(name)
+            
+            for name, keywords in sections.items():
+                if starts[name] == -1 and line_matches(line, keywords):
+                    starts[name] = i
+                    open_sections.add(name)
+            
+            if summary_start == -1 and line_matches(line, SUMMARY_KEYWORDS):
+                summary_start = i
+        
+        self.section_bounds = {
+            name: (starts[name], ends[name]) for name in sections if starts[name] != -1
+        }
+        self.summary_start = summary_start
+    
+    def section_range(self, keywords):
+        """Line range (start, end) of the section introduced by keywords, or None"""
+        start = next((i for i, line in enumerate(self.lower_lines) if line_matches(line, keywords)), -1)
+        if start == -1:
+            return None
+        
+        for i in range(start + 2, len(self.lower_lines)):
+            line = self.lower_lines[i]
+            if line_matches(line, SECTION_HEADING_KEYWORDS) and not line_matches(line, keywords):
+                return start, i
+        
+        return start, len(self.lower_lines)
+    
+    def section(self, name):
+        """Text of a registered section, or None"""
+        if name not in self._section_text:
+            bounds = self.section_bounds.get(name)
+            self._section_text[name] = '\n'.join(self.lines[bounds[0]:bounds[1]]) if bounds else None
+        return self._section_text[name]
+
 
 class ResumeParser:
-    def __init__(self):
-        self.education_keywords = [
-            'education', 'degree', 'university', 'college', 'bachelor', 'master', 
-            'phd', 'diploma', 'certification', 'course', 'school'
-        ]
-        
-        self.experience_keywords = [
-            'experience', 'work', 'employment', 'job', 'position', 'role',
-            'worked', 'served', 'employed', 'career', 'professional'
-        ]
-        
-        self.skill_keywords = [
-            'skills', 'technical skills', 'programming', 'languages', 
-            'technologies', 'tools', 'software', 'frameworks', 'libraries'
-        ]
+    # Cached results are reused only for the same version: bump the number
+    # when parsing code changes; the hash follows edits to the patterns and keywords
+    VERSION = '1-' + data_version(
+        PATTERNS, EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS, SKILL_KEYWORDS, CERTIFICATION_KEYWORDS,
+        SUMMARY_KEYWORDS, SECTION_HEADING_KEYWORDS, SUMMARY_STOP_KEYWORDS
+    )
+    
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.education_keywords = list(EDUCATION_KEYWORDS)
+        self.experience_keywords = list(EXPERIENCE_KEYWORDS)
+        self.skill_keywords = list(SKILL_KEYWORDS)
+        self._last_document = None
+    
+    def get_document(self, text):
+        """Return the line-indexed document for text, reusing the last one built"""
+        document = self._last_document
+        if document is None or document.text is not text:
+            document = ResumeDocument(text)
+            self._last_document = document
+        return document
     
     def parse_resume(self, file_path):
         """Parse resume and extract structured information"""
+        if self.cache is None:
+            return self.parse_resume_uncached(file_path)
+        
+        # Identical files parse to identical results, so serve them from the cache
+        return self.cache.parse_resume(self, file_path)
+    
+    def parse_resume_uncached(self, file_path):
+        """Parse resume without consulting the cache"""
         try:
             # Extract text based on file type
-            text = self.extract_text(file_path)
+            text, page_count = self.extract_text_with_pages(file_path)
             
             if not text:
                 return {'error': 'Could not extract text from file'}
             
+            # Split lines and index sections once for every extractor
+            self.get_document(text)
+            
             # Parse different sections
             parsed_data = {
                 'text': text,
+                'page_count': page_count,
                 'contact_info': self.extract_contact_info(text),
                 'education': self.extract_education(text),
                 'experience': self.extract_experience(text),
@@ -47,26 +196,35 @@ class ResumeParser:
     
     def extract_text(self, file_path):
         """Extract text from different file formats"""
+        return self.extract_text_with_pages(file_path)[0]
+    
+    def extract_text_with_pages(self, file_path):
+        """Extract text and page count (1 for non-PDF formats)"""
         file_extension = os.path.splitext(file_path)[1].lower()
         
         if file_extension == '.pdf':
-            return self.extract_pdf_text(file_path)
+            return self.extract_pdf_pages(file_path)
         elif file_extension in ['.doc', '.docx']:
-            return self.extract_docx_text(file_path)
+            return self.extract_docx_text(file_path), 1
         elif file_extension == '.txt':
-            return self.extract_txt_text(file_path)
+            return self.extract_txt_text(file_path), 1
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
     def extract_pdf_text(self, file_path):
         """Extract text from PDF file"""
+        return self.extract_pdf_pages(file_path)[0]
+    
+    def extract_pdf_pages(self, file_path):
+        """Extract text and page count from PDF file"""
         try:
             text = ""
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 for page in pdf_reader.pages:
                     text += page.extract_text() + "\n"
-            return text
+                page_count = len(pdf_reader.pages)
+            return text, page_count
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
     
@@ -94,29 +252,26 @@ class ResumeParser:
         contact_info = {}
         
         # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = PATTERNS['email'].findall(text)
         if emails:
             contact_info['email'] = emails[0]
         
         # Extract phone number
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
+        phones = PATTERNS['phone'].findall(text)
         if phones:
             contact_info['phone'] = ''.join(phones[0])
         
         # Extract LinkedIn profile
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin = re.search(linkedin_pattern, text, re.IGNORECASE)
+        linkedin = PATTERNS['linkedin'].search(text)
         if linkedin:
             contact_info['linkedin'] = linkedin.group()
         
         # Extract name (heuristic: first line that's not contact info)
-        lines = text.split('\n')
+        lines = self.get_document(text).lines
         for line in lines[:5]:  # Check first 5 lines
             line = line.strip()
             if line and len(line.split()) <= 4 and not any(keyword in line.lower() for keyword in ['email', 'phone', 'address']):
-                if not re.search(r'[0-9@]', line):
+                if not PATTERNS['name_excluded_chars'].search(line):
                     contact_info['name'] = line
                     break
         
@@ -127,18 +282,12 @@ class ResumeParser:
         education = []
         
         # Find education section
-        education_section = self.find_section(text, self.education_keywords)
+        education_section = self.get_document(text).section('education')
         
         if education_section:
             # Extract degrees
-            degree_patterns = [
-                r'(Bachelor|Master|PhD|Ph\.D|MBA|B\.S|M\.S|B\.A|M\.A)\s+.*?(\d{4})',
-                r'(Diploma|Certificate)\s+.*?(\d{4})',
-                r'(University|College)\s+.*?(\d{4})'
-            ]
-            
-            for pattern in degree_patterns:
-                matches = re.finditer(pattern, education_section, re.IGNORECASE)
+            for pattern in PATTERNS['degrees']:
+                matches = pattern.finditer(education_section)
                 for match in matches:
                     education.append({
                         'degree': match.group(1),
@@ -153,17 +302,12 @@ class ResumeParser:
         experience = []
         
         # Find experience section
-        experience_section = self.find_section(text, self.experience_keywords)
+        experience_section = self.get_document(text).section('experience')
         
         if experience_section:
             # Extract job titles and companies
-            job_patterns = [
-                r'([A-Z][a-z\s]+(?:Manager|Developer|Engineer|Analyst|Specialist|Coordinator|Director|Lead|Senior|Junior))\s*[-–]\s*([A-Z][A-Za-z\s&.,]+)?\s*\(?([\d]{4})\s*[-–]\s*([\d]{4}|Present)',
-                r'([A-Z][a-z\s]+(?:Manager|Developer|Engineer|Analyst|Specialist|Coordinator|Director|Lead|Senior|Junior))\s+at\s+([A-Z][A-Za-z\s&.,]+)\s*\(?([\d]{4})'
-            ]
-            
-            for pattern in job_patterns:
-                matches = re.finditer(pattern, experience_section, re.IGNORECASE | re.MULTILINE)
+            for pattern in PATTERNS['jobs']:
+                matches = pattern.finditer(experience_section)
                 for match in matches:
                     groups = match.groups()
                     experience.append({
@@ -181,19 +325,12 @@ class ResumeParser:
         skills = []
         
         # Find skills section
-        skills_section = self.find_section(text, self.skill_keywords)
+        skills_section = self.get_document(text).section('skills')
         
         if skills_section:
             # Common skill patterns
-            skill_patterns = [
-                r'([A-Z][a-zA-Z+#\s]+(?:Python|Java|JavaScript|React|Angular|Vue|Node|SQL|HTML|CSS|AWS|Docker|Git|Linux|Windows|MacOS|Office|Excel|PowerPoint|Photoshop|Illustrator))',
-                r'•\s*([A-Za-z+#\s]+)',
-                r'-\s*([A-Za-z+#\s]+)',
-                r'\n([A-Z][a-zA-Z+#\s]{2,20})(?:\n|$)',
-            ]
-            
-            for pattern in skill_patterns:
-                matches = re.findall(pattern, skills_section)
+            for pattern in PATTERNS['skills']:
+                matches = pattern.findall(skills_section)
                 for match in matches:
                     skill = match.strip() if isinstance(match, str) else match[0].strip()
                     if len(skill) > 1 and len(skill) < 30:
@@ -209,22 +346,16 @@ class ResumeParser:
     
     def extract_summary(self, text):
         """Extract professional summary or objective"""
-        summary_keywords = ['summary', 'objective', 'profile', 'about', 'overview']
-        
-        lines = text.split('\n')
-        summary_start = -1
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in summary_keywords):
-                summary_start = i
-                break
+        document = self.get_document(text)
+        lines = document.lines
+        summary_start = document.summary_start
         
         if summary_start != -1:
             # Extract next few lines as summary
             summary_lines = []
             for i in range(summary_start + 1, min(summary_start + 5, len(lines))):
                 line = lines[i].strip()
-                if line and not any(keyword in line.lower() for keyword in ['education', 'experience', 'skills']):
+                if line and not any(keyword in line.lower() for keyword in SUMMARY_STOP_KEYWORDS):
                     summary_lines.append(line)
                 else:
                     break
@@ -235,37 +366,19 @@ class ResumeParser:
     
     def find_section(self, text, keywords):
         """Find a section in the text based on keywords"""
-        lines = text.split('\n')
-        section_start = -1
-        section_end = len(lines)
+        document = self.get_document(text)
         
-        # Find section start
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in keywords):
-                section_start = i
-                break
+        # Registered sections were already bounded by the document scan
+        for name, section_keywords in SECTION_KEYWORDS.items():
+            if list(keywords) == section_keywords:
+                return document.section(name)
         
-        if section_start == -1:
+        bounds = document.section_range(keywords)
+        if bounds is None:
             return None
         
-        # Find section end (next major section)
-        other_section_keywords = [
-            'education', 'experience', 'skills', 'projects', 'certifications',
-            'achievements', 'awards', 'references', 'contact', 'summary'
-        ]
-        
-        current_keywords = set(keywords)
-        
-        for i in range(section_start + 2, len(lines)):
-            line = lines[i].lower().strip()
-            if any(keyword in line for keyword in other_section_keywords):
-                if not any(keyword in line for keyword in current_keywords):
-                    section_end = i
-                    break
-        
         # Extract section text
-        section_lines = lines[section_start:section_end]
-        return '\n'.join(section_lines)
+        return '\n'.join(document.lines[bounds[0]:bounds[1]])
     
     def calculate_experience_years(self, experience_list):
         """Calculate total years of experience"""
@@ -286,19 +399,12 @@ class ResumeParser:
         """Extract certifications and courses"""
         certifications = []
         
-        cert_keywords = ['certification', 'certificate', 'course', 'training', 'certified']
-        cert_section = self.find_section(text, cert_keywords)
+        cert_section = self.get_document(text).section('certifications')
         
         if cert_section:
             # Common certification patterns
-            cert_patterns = [
-                r'([A-Z][A-Za-z\s]+(?:Certification|Certificate|Course))\s*[-–]\s*([A-Za-z\s]+)?\s*\(?([\d]{4})',
-                r'([A-Z][A-Za-z\s]+)\s+Certified\s*\(?([\d]{4})',
-                r'([A-Z][A-Za-z\s]+)\s+Certificate\s*\(?([\d]{4})'
-            ]
-            
-            for pattern in cert_patterns:
-                matches = re.finditer(pattern, cert_section, re.IGNORECASE)
+            for pattern in PATTERNS['certifications']:
+                matches = pattern.finditer(cert_section)
                 for match in matches:
                     groups = match.groups()
                     certifications.append({
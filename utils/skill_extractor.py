@@ -1,62 +1,171 @@
 import re
+from bisect import bisect_left, bisect_right
 from collections import Counter
 import json
 
+from utils.resume_cache import data_version
+
+# Comprehensive skill database organized by categories
+SKILL_DATABASE = {
+    'programming_languages': [
+        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'php', 'ruby', 
+        'go', 'rust', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash'
+    ],
+    'web_technologies': [
+        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 
+        'flask', 'spring', 'bootstrap', 'jquery', 'sass', 'less', 'webpack', 'npm'
+    ],
+    'databases': [
+        'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 
+        'cassandra', 'elasticsearch', 'dynamodb', 'firebase'
+    ],
+    'cloud_platforms': [
+        'aws', 'azure', 'google cloud', 'gcp', 'heroku', 'digitalocean', 'linode'
+    ],
+    'devops_tools': [
+        'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab', 'bitbucket', 
+        'ansible', 'terraform', 'vagrant', 'chef', 'puppet'
+    ],
+    'data_science': [
+        'machine learning', 'deep learning', 'artificial intelligence', 'data analysis',
+        'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'matplotlib',
+        'seaborn', 'plotly', 'tableau', 'power bi', 'jupyter', 'statistics'
+    ],
+    'mobile_development': [
+        'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic'
+    ],
+    'design_tools': [
+        'photoshop', 'illustrator', 'figma', 'sketch', 'adobe xd', 'indesign', 
+        'canva', 'ui/ux design', 'user experience', 'user interface'
+    ],
+    'project_management': [
+        'agile', 'scrum', 'kanban', 'jira', 'trello', 'asana', 'monday.com', 
+        'project management', 'waterfall'
+    ],
+    'soft_skills': [
+        'communication', 'leadership', 'teamwork', 'problem solving', 'critical thinking',
+        'time management', 'adaptability', 'creativity', 'analytical thinking', 
+        'decision making', 'collaboration', 'negotiation', 'presentation'
+    ],
+    'business_skills': [
+        'business analysis', 'market research', 'strategic planning', 'financial analysis',
+        'risk management', 'process improvement', 'stakeholder management', 'budgeting'
+    ],
+    'microsoft_office': [
+        'excel', 'word', 'powerpoint', 'outlook', 'access', 'visio', 'sharepoint', 'teams'
+    ],
+    'operating_systems': [
+        'linux', 'unix', 'windows', 'macos', 'ubuntu', 'centos', 'debian'
+    ]
+}
+
+# Common skill patterns and variations
+SKILL_PATTERNS = {
+    'programming': r'\b(python|java|javascript|c\+\+|c#|php|ruby|go|rust|swift|kotlin)\b',
+    'web_framework': r'\b(react|angular|vue|django|flask|spring|express)\b',
+    'database': r'\b(sql|mysql|postgresql|mongodb|redis|oracle)\b',
+    'cloud': r'\b(aws|azure|google cloud|gcp|docker|kubernetes)\b',
+    'tools': r'\b(git|jenkins|jira|tableau|excel|photoshop)\b'
+}
+
+# Context words that set a skill's proficiency level, strongest first
+LEVEL_INDICATORS = {
+    5: ['expert', 'advanced', 'senior', 'lead', 'architect', 'specialist'],
+    4: ['proficient', 'experienced', 'skilled', 'strong', 'solid'],
+    3: ['intermediate', 'competent', 'working knowledge', 'familiar'],
+    2: ['basic', 'beginner', 'learning', 'exposure', 'some experience'],
+    1: ['novice', 'entry-level', 'introductory', 'fundamentals']
+}
+
+# Context words that indicate skill proficiency
+PROFICIENCY_INDICATORS = [
+    'expert', 'advanced', 'proficient', 'skilled', 'experienced', 
+    'familiar', 'knowledge', 'years', 'project', 'developed', 'built',
+    'implemented', 'designed', 'created', 'managed', 'led'
+]
+
+CATEGORY_CONTEXTS = {
+    'programming_languages': ['programming', 'coding', 'development', 'software', 'application'],
+    'web_technologies': ['web', 'frontend', 'backend', 'fullstack', 'website'],
+    'databases': ['database', 'data', 'query', 'storage', 'schema'],
+    'cloud_platforms': ['cloud', 'infrastructure', 'deployment', 'scalability'],
+    'data_science': ['analytics', 'analysis', 'modeling', 'prediction', 'insights'],
+    'design_tools': ['design', 'creative', 'visual', 'graphics', 'branding'],
+    'soft_skills': ['team', 'communication', 'management', 'leadership', 'collaboration']
+}
+
+# Characters of context captured on each side of a skill mention
+CONTEXT_WINDOW = 50
+
+WORD_BOUNDARY = re.compile(r'\b')
+
+
+def build_trie_pattern(words):
+    """Build a regex alternation factored by common prefixes.
+
+    Optional suffixes are greedy, so the longest word that matches at a
+    position is tried first and shorter ones are reached by backtracking.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Finds every whole-word mention of a fixed set of phrases in one pass.
+
+    All phrases are compiled once into a single prefix-factored alternation
+    inside a zero-width lookahead, so overlapping mentions (e.g. "react"
+    and "react native") are all reported with their offsets.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = sorted(set(phrases), key=lambda phrase: (-len(phrase), phrase))
+        self.pattern = re.compile(r'(?=\b(' + build_trie_pattern(self.phrases) + r')\b)')
+
+        # Shorter phrases that can match at the same offset as a longer one
+        self.prefixes = {
+            phrase: [other for other in self.phrases if len(other) < len(phrase) and phrase.startswith(other)]
+            for phrase in self.phrases
+        }
+
+    def find_all(self, text):
+        """Map each phrase found in text to the sorted list of its start offsets"""
+        mentions = {}
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            phrase = match.group(1)
+            mentions.setdefault(phrase, []).append(start)
+            for prefix in self.prefixes[phrase]:
+                if WORD_BOUNDARY.match(text, start + len(prefix)):
+                    mentions.setdefault(prefix, []).append(start)
+        return mentions
+
+
 class SkillExtractor:
+    # Cached results are reused only for the same version: bump the number
+    # when matching or scoring code changes; the hash follows edits to the data
+    VERSION = '1-' + data_version(
+        SKILL_DATABASE, SKILL_PATTERNS, LEVEL_INDICATORS, PROFICIENCY_INDICATORS, CATEGORY_CONTEXTS, CONTEXT_WINDOW
+    )
+    
     def __init__(self):
-        # Comprehensive skill database organized by categories
-        self.skill_database = {
-            'programming_languages': [
-                'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'php', 'ruby', 
-                'go', 'rust', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash'
-            ],
-            'web_technologies': [
-                'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 
-                'flask', 'spring', 'bootstrap', 'jquery', 'sass', 'less', 'webpack', 'npm'
-            ],
-            'databases': [
-                'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 
-                'cassandra', 'elasticsearch', 'dynamodb', 'firebase'
-            ],
-            'cloud_platforms': [
-                'aws', 'azure', 'google cloud', 'gcp', 'heroku', 'digitalocean', 'linode'
-            ],
-            'devops_tools': [
-                'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab', 'bitbucket', 
-                'ansible', 'terraform', 'vagrant', 'chef', 'puppet'
-            ],
-            'data_science': [
-                'machine learning', 'deep learning', 'artificial intelligence', 'data analysis',
-                'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'matplotlib',
-                'seaborn', 'plotly', 'tableau', 'power bi', 'jupyter', 'statistics'
-            ],
-            'mobile_development': [
-                'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic'
-            ],
-            'design_tools': [
-                'photoshop', 'illustrator', 'figma', 'sketch', 'adobe xd', 'indesign', 
-                'canva', 'ui/ux design', 'user experience', 'user interface'
-            ],
-            'project_management': [
-                'agile', 'scrum', 'kanban', 'jira', 'trello', 'asana', 'monday.com', 
-                'project management', 'waterfall'
-            ],
-            'soft_skills': [
-                'communication', 'leadership', 'teamwork', 'problem solving', 'critical thinking',
-                'time management', 'adaptability', 'creativity', 'analytical thinking', 
-                'decision making', 'collaboration', 'negotiation', 'presentation'
-            ],
-            'business_skills': [
-                'business analysis', 'market research', 'strategic planning', 'financial analysis',
-                'risk management', 'process improvement', 'stakeholder management', 'budgeting'
-            ],
-            'microsoft_office': [
-                'excel', 'word', 'powerpoint', 'outlook', 'access', 'visio', 'sharepoint', 'teams'
-            ],
-            'operating_systems': [
-                'linux', 'unix', 'windows', 'macos', 'ubuntu', 'centos', 'debian'
-            ]
-        }
+        self.skill_database = SKILL_DATABASE
         
         # Flatten skill database for easier searching
         self.all_skills = []
@@ -68,14 +177,12 @@ class SkillExtractor:
                     'variations': self.get_skill_variations(skill)
                 })
         
-        # Common skill patterns and variations
-        self.skill_patterns = {
-            'programming': r'\b(python|java|javascript|c\+\+|c#|php|ruby|go|rust|swift|kotlin)\b',
-            'web_framework': r'\b(react|angular|vue|django|flask|spring|express)\b',
-            'database': r'\b(sql|mysql|postgresql|mongodb|redis|oracle)\b',
-            'cloud': r'\b(aws|azure|google cloud|gcp|docker|kubernetes)\b',
-            'tools': r'\b(git|jenkins|jira|tableau|excel|photoshop)\b'
-        }
+        # Single-pass matcher over every variation of every skill
+        self.skill_matcher = SkillMatcher(
+            variation for skill_data in self.all_skills for variation in skill_data['variations']
+        )
+        
+        self.skill_patterns = SKILL_PATTERNS
     
     def get_skill_variations(self, skill):
         """Generate common variations of a skill name"""
@@ -118,7 +225,14 @@ class SkillExtractor:
         text_lower = text.lower()
         extracted_skills = {}
         
-        # Extract skills using pattern matching
+        # Find every mention of every variation in one scan
+        mentions = self.skill_matcher.find_all(text_lower)
+        newlines = [i for i, char in enumerate(text_lower) if char == '\n']
+        
+        match_counts = {}
+        context_confidences = {}
+        context_boosts = {}
+        
         for skill_data in self.all_skills:
             skill_name = skill_data['skill']
             variations = skill_data['variations']
@@ -129,19 +243,27 @@ class SkillExtractor:
             
             # Check for exact matches and variations
             for variation in variations:
-                pattern = r'\b' + re.escape(variation) + r'\b'
-                found_matches = len(re.findall(pattern, text_lower))
-                matches += found_matches
+                positions = mentions.get(variation)
+                if not positions:
+                    continue
+                
+                if variation not in match_counts:
+                    match_counts[variation] = self.count_mentions(positions, len(variation))
+                    context_confidences[variation] = self.context_confidence_from_offsets(
+                        text_lower, newlines, positions, len(variation)
+                    )
                 
-                if found_matches > 0:
-                    # Base confidence based on context
-                    confidence += self.calculate_context_confidence(text_lower, variation)
+                matches += match_counts[variation]
+                # Base confidence based on context
+                confidence += context_confidences[variation]
             
             # Calculate final confidence score
             if matches > 0:
                 # Boost confidence based on frequency
                 frequency_boost = min(matches * 0.1, 0.3)
-                context_boost = self.get_context_boost(text_lower, skill_name, category)
+                if category not in context_boosts:
+                    context_boosts[category] = self.get_context_boost(text_lower, skill_name, category)
+                context_boost = context_boosts[category]
                 
                 final_confidence = min(confidence + frequency_boost + context_boost, 1.0)
                 
@@ -152,17 +274,62 @@ class SkillExtractor:
         sorted_skills = dict(sorted(extracted_skills.items(), key=lambda x: x[1], reverse=True))
         return dict(list(sorted_skills.items())[:25])  # Return top 25 skills
     
+    def count_mentions(self, positions, length):
+        """Count non-overlapping mentions from sorted start offsets"""
+        count = 0
+        next_free = 0
+        for position in positions:
+            if position >= next_free:
+                count += 1
+                next_free = position + length
+        return count
+    
+    def context_confidence_from_offsets(self, text, newlines, positions, length):
+        """Calculate context confidence from known mention offsets.
+
+        Rebuilds the same context windows as calculate_context_confidence
+        (up to CONTEXT_WINDOW characters on each side, never crossing a
+        newline, non-overlapping) without rescanning the text.
+        """
+        base_confidence = 0.7
+        context_confidence = 0
+        text_length = len(text)
+        
+        def line_start(offset):
+            index = bisect_left(newlines, offset)
+            return newlines[index - 1] + 1 if index else 0
+        
+        def line_end(offset):
+            index = bisect_left(newlines, offset)
+            return newlines[index] if index < len(newlines) else text_length
+        
+        search_from = 0
+        index = bisect_left(positions, search_from)
+        while index < len(positions):
+            first = positions[index]
+            start = max(search_from, first - CONTEXT_WINDOW, line_start(first))
+            
+            # The leading window is greedy, so it reaches the last mention in range
+            limit = min(start + CONTEXT_WINDOW, line_end(start))
+            mention = positions[bisect_right(positions, limit) - 1]
+            
+            mention_end = mention + length
+            end = min(mention_end + CONTEXT_WINDOW, line_end(mention_end))
+            
+            context = text[start:end]
+            for indicator in PROFICIENCY_INDICATORS:
+                if indicator in context:
+                    context_confidence += 0.1
+            
+            search_from = end
+            index = bisect_left(positions, search_from)
+        
+        return min(base_confidence + context_confidence, 1.0)
+    
     def calculate_context_confidence(self, text, skill):
         """Calculate confidence based on context around skill mentions"""
         base_confidence = 0.7
         
-        # Context words that indicate skill proficiency
-        proficiency_indicators = [
-            'expert', 'advanced', 'proficient', 'skilled', 'experienced', 
-            'familiar', 'knowledge', 'years', 'project', 'developed', 'built',
-            'implemented', 'designed', 'created', 'managed', 'led'
-        ]
-        
         # Find skill mentions in context
         skill_pattern = r'.{0,50}\b' + re.escape(skill) + r'\b.{0,50}'
         contexts = re.findall(skill_pattern, text, re.IGNORECASE)
@@ -170,7 +337,7 @@ class SkillExtractor:
         context_confidence = 0
         for context in contexts:
             context_lower = context.lower()
-            for indicator in proficiency_indicators:
+            for indicator in PROFICIENCY_INDICATORS:
                 if indicator in context_lower:
                     context_confidence += 0.1
         
@@ -178,17 +345,7 @@ class SkillExtractor:
     
     def get_context_boost(self, text, skill, category):
         """Get confidence boost based on skill category context"""
-        category_contexts = {
-            'programming_languages': ['programming', 'coding', 'development', 'software', 'application'],
-            'web_technologies': ['web', 'frontend', 'backend', 'fullstack', 'website'],
-            'databases': ['database', 'data', 'query', 'storage', 'schema'],
-            'cloud_platforms': ['cloud', 'infrastructure', 'deployment', 'scalability'],
-            'data_science': ['analytics', 'analysis', 'modeling', 'prediction', 'insights'],
-            'design_tools': ['design', 'creative', 'visual', 'graphics', 'branding'],
-            'soft_skills': ['team', 'communication', 'management', 'leadership', 'collaboration']
-        }
-        
-        context_words = category_contexts.get(category, [])
+        context_words = CATEGORY_CONTEXTS.get(category, [])
         boost = 0
         
         for word in context_words:
@@ -201,14 +358,6 @@ class SkillExtractor:
         """Extract proficiency levels for identified skills"""
         skill_levels = {}
         
-        level_indicators = {
-            5: ['expert', 'advanced', 'senior', 'lead', 'architect', 'specialist'],
-            4: ['proficient', 'experienced', 'skilled', 'strong', 'solid'],
-            3: ['intermediate', 'competent', 'working knowledge', 'familiar'],
-            2: ['basic', 'beginner', 'learning', 'exposure', 'some experience'],
-            1: ['novice', 'entry-level', 'introductory', 'fundamentals']
-        }
-        
         text_lower = text.lower()
         
         for skill in skills:
@@ -220,7 +369,7 @@ class SkillExtractor:
             contexts = re.findall(skill_pattern, text_lower)
             
             for context in contexts:
-                for level, indicators in level_indicators.items():
+                for level, indicators in LEVEL_INDICATORS.items():
                     if any(indicator in context for indicator in indicators):
                         skill_level = max(skill_level, level)
                         break